@@ -43,6 +43,8 @@ class RoleButton(discord.ui.Button):
                 "ROLE_REMOVE",
                 f"User {interaction.user.name}#{interaction.user.discriminator} "
                 f"(ID: {interaction.user.id}) removed role {role.name}",
+                user_id=interaction.user.id,
+                role_id=role.id,
             )
         else:
             await interaction.user.add_roles(role)
@@ -53,6 +55,8 @@ class RoleButton(discord.ui.Button):
                 "ROLE_ADD",
                 f"User {interaction.user.name}#{interaction.user.discriminator} "
                 f"(ID: {interaction.user.id}) received role {role.name}",
+                user_id=interaction.user.id,
+                role_id=role.id,
             )
 
         await interaction.response.send_message(
@@ -106,7 +110,7 @@ class AutoroleSetupView(discord.ui.View):
         self.bot.config["autorole"]["enabled"] = not self.bot.config["autorole"][
             "enabled"
         ]
-        self.bot.save_config()
+        self.bot.save_config("autorole")
         self.update_buttons()
 
         # Mettre à jour le message des rôles si nécessaire
@@ -138,7 +142,7 @@ class AutoroleSetupView(discord.ui.View):
 
             message = await channel.send("🎭 **Choisissez vos rôles**", view=view)
             self.bot.config["autorole"]["message_id"] = message.id
-            self.bot.save_config()
+            self.bot.save_config("autorole")
             self.bot.add_view(view, message_id=message.id)
 
         except Exception as e:
@@ -168,7 +172,7 @@ class AutoroleChannelModal(discord.ui.Modal, title="Autorole Channel Setup"):
                 return
 
             self.bot.config["autorole"]["channel_id"] = channel_id
-            self.bot.save_config()
+            self.bot.save_config("autorole")
 
             # Mettre à jour ou créer le message des rôles
             if self.bot.config["autorole"]["enabled"]:
@@ -210,7 +214,7 @@ class AddRoleModal(discord.ui.Modal, title="Add Autorole"):
                 return
 
             self.bot.config["autorole"]["roles"][str(role_id)] = self.emoji.value
-            self.bot.save_config()
+            self.bot.save_config("autorole")
 
             # Debug: afficher les rôles actuels
             print(f"Rôles actuels: {self.bot.config['autorole']['roles']}")
@@ -250,7 +254,7 @@ class RemoveRoleModal(discord.ui.Modal, title="Remove Autorole"):
                 return
 
             del self.bot.config["autorole"]["roles"][role_id]
-            self.bot.save_config()
+            self.bot.save_config("autorole")
 
             # Mettre à jour le message des rôles
             if self.bot.config["autorole"]["enabled"]:
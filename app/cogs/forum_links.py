@@ -6,6 +6,7 @@ from discord import app_commands
 class ForumLinks(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.state = bot.get_state("forum", {"links": {}})
 
     @app_commands.command(
         name="lier", description="Lier un salon au forum avec des tags spécifiques"
@@ -70,11 +71,8 @@ class ForumLinks(commands.Cog):
             return
 
         # Sauvegarder la liaison
-        if "links" not in self.bot.config["forum"]:
-            self.bot.config["forum"]["links"] = {}
-
-        self.bot.config["forum"]["links"][str(channel.id)] = {"tags": valid_tags}
-        self.bot.save_config()
+        self.state.data["links"][str(channel.id)] = {"tags": valid_tags}
+        self.state.mark_dirty()
 
         await interaction.response.send_message(
             f"✅ Salon {channel.mention} lié avec succès!\n"
@@ -91,7 +89,7 @@ class ForumLinks(commands.Cog):
 
             # Vérifier si le salon est lié
             forum_config = self.bot.config.get("forum", {})
-            channel_links = forum_config.get("links", {})
+            channel_links = self.state.data["links"]
 
             if str(message.channel.id) not in channel_links:
                 return
@@ -177,6 +175,10 @@ class ForumLinks(commands.Cog):
                     "FORUM_LINK",
                     f"Message du serveur {message.guild.name} dans #{message.channel.name} "
                     f"transféré vers {thread.name}",
+                    guild_id=message.guild.id,
+                    channel_id=message.channel.id,
+                    user_id=message.author.id,
+                    thread_id=thread.id,
                 )
 
             except discord.Forbidden:
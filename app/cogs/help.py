@@ -1,4 +1,5 @@
 import os
+import asyncio
 import discord
 from discord.ext import commands
 from discord import app_commands
@@ -45,6 +46,7 @@ class Help(commands.Cog):
                     ("/voc-limit [limit]", "Définir une limite d'utilisateurs"),
                     ("/voc-close", "Fermer votre salon"),
                     ("/voc-open", "Ouvrir votre salon"),
+                    ("/jtc-stats", "Voir la réserve et la file des salons"),
                 ],
             },
             "tickets": {
@@ -54,6 +56,8 @@ class Help(commands.Cog):
                     ("Bouton 'Create Ticket'", "Créer un nouveau ticket"),
                     ("Bouton 'Close'", "Fermer un ticket"),
                     ("Bouton 'Delete'", "Supprimer un ticket fermé"),
+                    ("/ticket-history [user]", "Voir les tickets archivés"),
+                    ("/ticket-stats [days]", "Voir les délais de traitement"),
                 ],
             },
             "reminders": {
@@ -156,50 +160,56 @@ class Help(commands.Cog):
 
         filename, title = log_files[type]
 
+        writer = self.bot.get_log(filename)
+
         try:
-            # Lire le fichier de logs
-            with open(filename, "r", encoding="utf-8") as f:
-                # Lire les dernières lignes
-                all_lines = f.readlines()
-                last_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-
-                if not last_lines:
-                    await interaction.response.send_message(
-                        "📝 Aucun log disponible pour le moment!", ephemeral=True
-                    )
-                    return
-
-                # Créer l'embed
-                embed = discord.Embed(
-                    title=f"📋 {title}",
-                    description=f"Dernières {len(last_lines)} entrées:",
-                    color=discord.Color.blue(),
-                )
+            # Lire les dernières lignes depuis la fin du fichier, hors de la boucle
+            last_lines = await asyncio.to_thread(writer.storage.tail, lines)
+            total = await asyncio.to_thread(writer.storage.line_count)
 
-                # Formater les logs
-                log_content = "```\n"
-                for line in last_lines:
-                    # Limiter la longueur de chaque ligne pour l'affichage
-                    if len(log_content) + len(line) > 1000:
-                        log_content += "...\n"
-                        break
-                    log_content += line
+            if not last_lines:
+                await interaction.response.send_message(
+                    "📝 Aucun log disponible pour le moment!", ephemeral=True
+                )
+                return
 
-                log_content += "```"
+            # Créer l'embed
+            embed = discord.Embed(
+                title=f"📋 {title}",
+                description=f"Dernières {len(last_lines)} entrées:",
+                color=discord.Color.blue(),
+            )
 
-                embed.add_field(name="Logs", value=log_content, inline=False)
+            # Formater les logs
+            log_content = "```\n"
+            for line in last_lines:
+                # Limiter la longueur de chaque ligne pour l'affichage
+                if len(log_content) + len(line) > 1000:
+                    log_content += "...\n"
+                    break
+                log_content += line
+
+            log_content += "```"
+
+            embed.add_field(name="Logs", value=log_content, inline=False)
+
+            # Métriques de l'écriture en arrière-plan du fichier
+            stats = writer.stats()
+            embed.add_field(
+                name="Archive",
+                value=f"File d'attente: {stats['queue_depth']} | "
+                f"Dernière écriture: {stats['last_flush_ms']:.1f} ms | "
+                f"Max: {stats['max_flush_ms']:.1f} ms",
+                inline=False,
+            )
 
-                # Ajouter des informations supplémentaires
-                embed.set_footer(
-                    text=f"Total des logs: {len(all_lines)} | Affichage: {len(last_lines)}"
-                )
+            # Ajouter des informations supplémentaires
+            embed.set_footer(
+                text=f"Total des logs: {total} | Affichage: {len(last_lines)}"
+            )
 
-                await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
 
-        except FileNotFoundError:
-            await interaction.response.send_message(
-                f"❌ Fichier de logs '{filename}' introuvable!", ephemeral=True
-            )
         except Exception as e:
             await interaction.response.send_message(
                 f"❌ Erreur lors de la lecture des logs: {str(e)}", ephemeral=True
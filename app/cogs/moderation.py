@@ -3,12 +3,23 @@ from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timedelta
 import json
-import re
 import asyncio
 from typing import Optional
+from utils.word_filter import BannedWordMatcher
+from utils.log_writer import BatchedWriter
+from utils.message_index import MessageIndex
 
 MESSAGES_PATH = "/home/app/messages.txt"
-INFRACTIONS_PATH = "/home/app/infractions.json"
+SEARCH_DATE_FORMATS = ("%Y-%m-%d %H:%M", "%Y-%m-%d")
+
+INFRACTION_COUNTERS = (
+    "current_infractions",
+    "total_infractions",
+    "current_timeouts",
+    "total_timeouts",
+    "current_kicks",
+    "total_kicks",
+)
 
 
 class BannedWordsView(discord.ui.View):
@@ -52,6 +63,24 @@ class BannedWordsView(discord.ui.View):
         await interaction.response.edit_message(embed=embed, view=self)
 
 
+class SearchResultsView(BannedWordsView):
+    def __init__(self, bot, chunks, total: int):
+        self.total = total
+        super().__init__(bot, chunks)
+
+    async def update_message(self, interaction: discord.Interaction):
+        embed = discord.Embed(
+            title=f"Message Search ({self.total} results)",
+            description=f"Page {self.current_page + 1}/{len(self.chunks)}",
+            color=discord.Color.blue(),
+        )
+
+        chunk = self.chunks[self.current_page]
+        embed.add_field(name="Messages", value="\n".join(chunk), inline=False)
+
+        await interaction.response.edit_message(embed=embed, view=self)
+
+
 class ModActionView(discord.ui.View):
     def __init__(self, bot, user: discord.Member, action_type: str):
         super().__init__(timeout=300)
@@ -119,7 +148,7 @@ class ModerationSetupView(discord.ui.View):
         self.bot.config["moderation"]["enabled"] = not self.bot.config["moderation"][
             "enabled"
         ]
-        self.bot.save_config()
+        self.bot.save_config("moderation")
         self.update_buttons()
         await interaction.response.edit_message(view=self)
 
@@ -144,7 +173,7 @@ class ModChannelModal(discord.ui.Modal, title="Moderation Channel Setup"):
                 return
 
             self.bot.config["moderation"]["mod_channel_id"] = channel_id
-            self.bot.save_config()
+            self.bot.save_config("moderation")
             await interaction.response.send_message(
                 f"✅ Moderation channel set to {channel.mention}!", ephemeral=True
             )
@@ -173,7 +202,7 @@ class TimeoutDurationModal(discord.ui.Modal, title="Timeout Duration Setup"):
                 return
 
             self.bot.config["moderation"]["timeout_duration"] = minutes
-            self.bot.save_config()
+            self.bot.save_config("moderation")
             await interaction.response.send_message(
                 f"✅ Timeout duration set to {minutes} minutes!", ephemeral=True
             )
@@ -204,7 +233,7 @@ class BanDurationModal(discord.ui.Modal, title="Ban Duration Setup"):
                 return
 
             self.bot.config["moderation"]["ban_duration"] = days
-            self.bot.save_config()
+            self.bot.save_config("moderation")
             await interaction.response.send_message(
                 f"✅ Ban duration set to {days} days!", ephemeral=True
             )
@@ -217,56 +246,79 @@ class BanDurationModal(discord.ui.Modal, title="Ban Duration Setup"):
 class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.infractions = self.load_infractions()
-
-    def load_infractions(self) -> dict:
-        """Charge les infractions depuis le fichier infractions.json"""
-        try:
-            with open(INFRACTIONS_PATH, "r") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            # Si le fichier n'existe pas ou est corrompu, créer un nouveau
-            infractions = {}
-            self.save_infractions(infractions)
-            return infractions
-
-    def save_infractions(self, infractions: dict):
-        """Sauvegarde les infractions dans le fichier infractions.json"""
-        with open(INFRACTIONS_PATH, "w") as f:
-            json.dump(infractions, f, indent=4)
-
-    def get_user_data(self, user_id: str) -> dict:
-        """Obtient ou crée les données d'un utilisateur"""
+        # Cache des compteurs d'infractions déjà lus en base
+        self.infractions = {}
+        self.rebuild_matcher()
+        # Archive des messages écrite par lots en arrière-plan
+        self.archive = bot.get_log(MESSAGES_PATH)
+        # Index de recherche alimenté par le même flux que l'archive
+        self.index = BatchedWriter(MessageIndex())
+
+    def rebuild_matcher(self):
+        """Recompile la recherche après une modification des mots interdits"""
+        self.matcher = BannedWordMatcher(self.bot.config["moderation"]["banned_words"])
+
+    async def get_user_data(self, user_id: str) -> dict:
+        """Obtient ou crée les compteurs d'un utilisateur"""
         if user_id not in self.infractions:
-            self.infractions[user_id] = {
-                "current_infractions": 0,
-                "total_infractions": 0,
-                "current_timeouts": 0,
-                "total_timeouts": 0,
-                "current_kicks": 0,
-                "total_kicks": 0,
-                "history": [],
-            }
+            row = await self.bot.db.fetchone(
+                "SELECT * FROM infraction_users WHERE user_id = ?", (int(user_id),)
+            )
+            # Un appel concurrent a pu remplir le cache pendant la lecture :
+            # garder son dictionnaire (et ses incréments), pas la ligne lue
+            self.infractions.setdefault(
+                user_id,
+                {
+                    counter: row[counter] if row else 0
+                    for counter in INFRACTION_COUNTERS
+                },
+            )
         return self.infractions[user_id]
 
-    def check_message(self, content: str) -> str | None:
-        """Vérifie si le message contient des mots interdits"""
-        # Convertir le message en minuscules
-        content = content.lower()
+    async def save_user_data(self, user_id: str):
+        """Sauvegarde les compteurs d'un utilisateur"""
+        user_data = self.infractions[user_id]
+        await self.bot.db.execute(
+            f"INSERT OR REPLACE INTO infraction_users (user_id, {', '.join(INFRACTION_COUNTERS)}) "
+            f"VALUES (?, {', '.join('?' for _ in INFRACTION_COUNTERS)})",
+            (int(user_id), *(user_data[counter] for counter in INFRACTION_COUNTERS)),
+        )
 
-        # Séparer le message en mots (en gardant la ponctuation pour vérification)
-        words = re.findall(r"\b\w+\b", content)
+    async def add_history(self, user_id: str, entry: dict):
+        """Ajoute une entrée à l'historique de modération d'un utilisateur"""
+        await self.bot.db.execute(
+            "INSERT INTO infraction_history (user_id, type, date, data) VALUES (?, ?, ?, ?)",
+            (int(user_id), entry["type"], entry["date"], json.dumps(entry)),
+        )
 
-        for banned_word in self.bot.config["moderation"]["banned_words"]:
-            # Vérifier si le mot banni est dans la liste des mots du message
-            if banned_word in words:
-                return banned_word
+    async def get_history(self, user_id: str) -> list:
+        rows = await self.bot.db.fetchall(
+            "SELECT data FROM infraction_history WHERE user_id = ? ORDER BY id",
+            (int(user_id),),
+        )
+        return [json.loads(row["data"]) for row in rows]
 
-            # Vérifier aussi les combinaisons de mots (pour les phrases bannies)
-            if " " in banned_word and banned_word in content:
-                return banned_word
+    def check_message(self, content: str) -> str | None:
+        """Vérifie si le message contient des mots interdits"""
+        return self.matcher.find(content)
 
-        return None
+    def index_message(
+        self, message: discord.Message, kind: str, date: datetime, content: str
+    ):
+        """Ajoute un message à l'index de recherche"""
+        self.index.write(
+            (
+                message.id,
+                message.guild.id,
+                message.channel.id,
+                getattr(message.channel, "name", "DM"),
+                message.author.id,
+                message.author.name,
+                kind,
+                date.timestamp(),
+                content,
+            )
+        )
 
     def save_message(self, message: discord.Message):
         """Sauvegarde un message dans messages.txt"""
@@ -305,12 +357,26 @@ class Moderation(commands.Cog):
 
         log_entry += "\n"
 
-        with open(MESSAGES_PATH, "a", encoding="utf-8") as f:
-            f.write(log_entry)
+        self.archive.write(log_entry)
+        self.index_message(
+            message,
+            "message",
+            message.created_at,
+            "\n".join([message.content, *(a.url for a in message.attachments)]),
+        )
+        self.bot.log_event(
+            "MESSAGE",
+            message_id=message.id,
+            guild_id=message.guild.id,
+            channel_id=message.channel.id,
+            user_id=message.author.id,
+            content=message.content,
+            attachments=[attachment.url for attachment in message.attachments],
+        )
 
     async def handle_moderation(self, message: discord.Message, banned_word: str):
         user_id = str(message.author.id)
-        user_data = self.get_user_data(user_id)
+        user_data = await self.get_user_data(user_id)
 
         # Ajouter l'infraction à l'historique
         infraction = {
@@ -321,9 +387,10 @@ class Moderation(commands.Cog):
             "channel_id": message.channel.id,
             "message_id": message.id,
         }
-        user_data["history"].append(infraction)
+        await self.add_history(user_id, infraction)
         user_data["current_infractions"] += 1
         user_data["total_infractions"] += 1
+        await self.save_user_data(user_id)
 
         # Vérifier les conditions pour les actions de modération
         if user_data["current_kicks"] > 0:
@@ -336,8 +403,6 @@ class Moderation(commands.Cog):
             # Demande de timeout après 5 infractions
             await self.request_moderation_action(message.author, "timeout")
 
-        self.save_infractions(self.infractions)
-
     async def request_moderation_action(self, user: discord.Member, action_type: str):
         # Utiliser le salon configuré ou chercher mod-logs comme fallback
         mod_channel_id = self.bot.config["moderation"]["mod_channel_id"]
@@ -371,7 +436,7 @@ class Moderation(commands.Cog):
         await view.wait()
 
         if view.result is True:
-            user_data = self.get_user_data(str(user.id))
+            user_data = await self.get_user_data(str(user.id))
 
             if action_type == "timeout":
                 duration = timedelta(
@@ -404,7 +469,7 @@ class Moderation(commands.Cog):
         embed.add_field(name="Result", value=f"Action {action_result}")
         await msg.edit(embed=embed, view=None)
 
-        self.save_infractions(self.infractions)
+        await self.save_user_data(str(user.id))
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -446,6 +511,11 @@ class Moderation(commands.Cog):
                 "MODERATION_INFRACTION",
                 f"User: {message.author.name}#{message.author.discriminator} (ID: {message.author.id}) "
                 f"used banned word '{banned_word}' in message: {message.content}",
+                user_id=message.author.id,
+                guild_id=message.guild.id,
+                channel_id=message.channel.id,
+                message_id=message.id,
+                word=banned_word,
             )
 
     @commands.Cog.listener()
@@ -467,8 +537,17 @@ class Moderation(commands.Cog):
                 f"After: {after.content}\n"
             )
 
-            with open(MESSAGES_PATH, "a", encoding="utf-8") as f:
-                f.write(log_entry)
+            self.archive.write(log_entry)
+            self.index_message(after, "edit", after.edited_at, after.content)
+            self.bot.log_event(
+                "MESSAGE_EDIT",
+                message_id=after.id,
+                guild_id=after.guild.id,
+                channel_id=after.channel.id,
+                user_id=after.author.id,
+                before=before.content,
+                after=after.content,
+            )
 
             # Vérifier les mots interdits dans le message édité
             if self.bot.config["moderation"]["enabled"]:
@@ -492,8 +571,16 @@ class Moderation(commands.Cog):
                 f"{message.content}\n"
             )
 
-            with open(MESSAGES_PATH, "a", encoding="utf-8") as f:
-                f.write(log_entry)
+            self.archive.write(log_entry)
+            self.index_message(message, "delete", datetime.now(), message.content)
+            self.bot.log_event(
+                "MESSAGE_DELETE",
+                message_id=message.id,
+                guild_id=message.guild.id,
+                channel_id=message.channel.id,
+                user_id=message.author.id,
+                content=message.content,
+            )
 
     @app_commands.command(name="infractions", description="View infractions for a user")
     @app_commands.default_permissions(manage_messages=True)
@@ -501,13 +588,17 @@ class Moderation(commands.Cog):
         self, interaction: discord.Interaction, user: discord.Member
     ):
         user_id = str(user.id)
-        if user_id not in self.infractions:
+        row = await self.bot.db.fetchone(
+            "SELECT * FROM infraction_users WHERE user_id = ?", (user.id,)
+        )
+        if not row:
             await interaction.response.send_message(
                 f"No infractions found for {user.mention}", ephemeral=True
             )
             return
 
-        user_data = self.infractions[user_id]
+        user_data = await self.get_user_data(user_id)
+        history_entries = await self.get_history(user_id)
 
         embed = discord.Embed(
             title=f"Moderation History for {user.name}#{user.discriminator}",
@@ -526,9 +617,9 @@ class Moderation(commands.Cog):
         embed.add_field(name="Statistics", value=stats, inline=False)
 
         # Historique détaillé
-        if user_data["history"]:
+        if history_entries:
             history = []
-            for entry in user_data["history"]:
+            for entry in history_entries:
                 if entry["type"] == "infraction":
                     history.append(
                         f"[{entry['date']}] INFRACTION\n"
@@ -586,45 +677,41 @@ class Moderation(commands.Cog):
         self, interaction: discord.Interaction, user: discord.Member
     ):
         user_id = str(user.id)
-        if user_id not in self.infractions:
+        row = await self.bot.db.fetchone(
+            "SELECT user_id FROM infraction_users WHERE user_id = ?", (user.id,)
+        )
+        if not row:
             await interaction.response.send_message(
                 f"No infractions found for {user.mention}", ephemeral=True
             )
             return
 
-        # Sauvegarder les anciennes données dans l'historique
-        old_data = self.infractions[user_id]
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        # Réinitialiser les données de l'utilisateur
-        self.infractions[user_id] = {
-            "current_infractions": 0,
-            "total_infractions": old_data[
-                "total_infractions"
-            ],  # Garder le total historique
-            "current_timeouts": 0,
-            "total_timeouts": old_data["total_timeouts"],  # Garder le total historique
-            "current_kicks": 0,
-            "total_kicks": old_data["total_kicks"],  # Garder le total historique
-            "history": old_data["history"],  # Garder l'historique
-        }
+        # Réinitialiser les compteurs courants (les totaux historiques sont gardés)
+        user_data = await self.get_user_data(user_id)
+        user_data["current_infractions"] = 0
+        user_data["current_timeouts"] = 0
+        user_data["current_kicks"] = 0
+        await self.save_user_data(user_id)
 
         # Ajouter l'action de clear à l'historique
-        self.infractions[user_id]["history"].append(
+        await self.add_history(
+            user_id,
             {
                 "type": "clear",
                 "date": timestamp,
                 "cleared_by": f"{interaction.user.name}#{interaction.user.discriminator} (ID: {interaction.user.id})",
-            }
+            },
         )
 
-        self.save_infractions(self.infractions)
-
         # Log l'action
         self.bot.log_to_file(
             "MODERATION",
             f"All current infractions cleared for {user.name}#{user.discriminator} "
             f"(ID: {user.id}) by {interaction.user.name}#{interaction.user.discriminator}",
+            user_id=user.id,
+            moderator_id=interaction.user.id,
         )
 
         await interaction.response.send_message(
@@ -656,12 +743,15 @@ class Moderation(commands.Cog):
                 added_words.append(word)
 
         if added_words:
-            self.bot.save_config()
+            self.rebuild_matcher()
+            self.bot.save_config("moderation")
             # Log l'ajout
             self.bot.log_to_file(
                 "MODERATION_CONFIG",
                 f"Banned words added by {interaction.user.name}#{interaction.user.discriminator} "
                 f"(ID: {interaction.user.id}): {', '.join(added_words)}",
+                moderator_id=interaction.user.id,
+                words=added_words,
             )
 
         # Préparer le message de réponse
@@ -696,12 +786,15 @@ class Moderation(commands.Cog):
             return
 
         self.bot.config["moderation"]["banned_words"].remove(word)
-        self.bot.save_config()
+        self.rebuild_matcher()
+        self.bot.save_config("moderation")
 
         # Log la suppression
         self.bot.log_to_file(
             "MODERATION_CONFIG",
             f"Banned word removed by {interaction.user.name}#{interaction.user.discriminator} (ID: {interaction.user.id}): {word}",
+            moderator_id=interaction.user.id,
+            word=word,
         )
 
         await interaction.response.send_message(
@@ -734,6 +827,87 @@ class Moderation(commands.Cog):
         view = BannedWordsView(self.bot, chunks)
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
+    @app_commands.command(
+        name="search-messages", description="Search the message archive"
+    )
+    @app_commands.describe(
+        author="Author of the messages",
+        channel="Channel of the messages",
+        text="Text contained in the messages",
+        since="Start date (YYYY-MM-DD or YYYY-MM-DD HH:MM)",
+        until="End date (YYYY-MM-DD or YYYY-MM-DD HH:MM)",
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def search_messages(
+        self,
+        interaction: discord.Interaction,
+        author: Optional[discord.User] = None,
+        channel: Optional[discord.TextChannel] = None,
+        text: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ):
+        dates = {}
+        for name, value in (("since", since), ("until", until)):
+            if value is None:
+                continue
+            for date_format in SEARCH_DATE_FORMATS:
+                try:
+                    dates[name] = datetime.strptime(value, date_format).timestamp()
+                    break
+                except ValueError:
+                    pass
+            else:
+                await interaction.response.send_message(
+                    f"❌ Invalid date: `{value}` (YYYY-MM-DD or YYYY-MM-DD HH:MM)",
+                    ephemeral=True,
+                )
+                return
+        # Une date sans heure couvre toute la journée
+        if until and len(until) == 10:
+            dates["until"] += 86399
+
+        results = await asyncio.to_thread(
+            self.index.storage.search,
+            author_id=author.id if author else None,
+            channel_id=channel.id if channel else None,
+            since=dates.get("since"),
+            until=dates.get("until"),
+            text=text,
+        )
+        if not results:
+            await interaction.response.send_message("No messages found", ephemeral=True)
+            return
+
+        lines = []
+        for row in results:
+            date = datetime.fromtimestamp(row["created_at"]).strftime("%Y-%m-%d %H:%M")
+            kind = f" [{row['kind'].upper()}]" if row["kind"] != "message" else ""
+            content = row["content"].replace("\n", " ")
+            if len(content) > 150:
+                content = content[:150] + "..."
+            lines.append(
+                f"`{date}`{kind} #{row['channel_name']} <@{row['author_id']}>: {content}"
+            )
+        # Grouper les résultats par 5 pour chaque page, sans dépasser les
+        # 1024 caractères d'un champ d'embed
+        chunks = [[]]
+        for line in lines:
+            if len(chunks[-1]) == 5 or len("\n".join(chunks[-1] + [line])) > 1024:
+                chunks.append([])
+            chunks[-1].append(line)
+
+        embed = discord.Embed(
+            title=f"Message Search ({len(results)} results)",
+            description=f"Page 1/{len(chunks)}",
+            color=discord.Color.blue(),
+        )
+
+        embed.add_field(name="Messages", value="\n".join(chunks[0]), inline=False)
+
+        view = SearchResultsView(self.bot, chunks, len(results))
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+
     @app_commands.command(
         name="toggle-moderation", description="Enable or disable word moderation"
     )
@@ -744,12 +918,14 @@ class Moderation(commands.Cog):
         ]
         status = "enabled" if self.bot.config["moderation"]["enabled"] else "disabled"
 
-        self.bot.save_config()
+        self.bot.save_config("moderation")
 
         # Log le changement
         self.bot.log_to_file(
             "MODERATION_CONFIG",
             f"Word moderation {status} by {interaction.user.name}#{interaction.user.discriminator} (ID: {interaction.user.id})",
+            moderator_id=interaction.user.id,
+            enabled=self.bot.config["moderation"]["enabled"],
         )
 
         await interaction.response.send_message(
@@ -771,11 +947,13 @@ class Moderation(commands.Cog):
             return
 
         self.bot.config["moderation"]["timeout_duration"] = minutes
-        self.bot.save_config()
+        self.bot.save_config("moderation")
 
         self.bot.log_to_file(
             "MODERATION_CONFIG",
             f"Timeout duration set to {minutes} minutes by {interaction.user.name}#{interaction.user.discriminator}",
+            moderator_id=interaction.user.id,
+            timeout_duration=minutes,
         )
 
         await interaction.response.send_message(
@@ -794,11 +972,13 @@ class Moderation(commands.Cog):
             return
 
         self.bot.config["moderation"]["ban_duration"] = days
-        self.bot.save_config()
+        self.bot.save_config("moderation")
 
         self.bot.log_to_file(
             "MODERATION_CONFIG",
             f"Ban duration set to {days} days by {interaction.user.name}#{interaction.user.discriminator}",
+            moderator_id=interaction.user.id,
+            ban_duration=days,
         )
 
         await interaction.response.send_message(
@@ -814,11 +994,13 @@ class Moderation(commands.Cog):
         self, interaction: discord.Interaction, channel: discord.TextChannel
     ):
         self.bot.config["moderation"]["mod_channel_id"] = channel.id
-        self.bot.save_config()
+        self.bot.save_config("moderation")
 
         self.bot.log_to_file(
             "MODERATION_CONFIG",
             f"Moderation channel set to #{channel.name} by {interaction.user.name}#{interaction.user.discriminator}",
+            moderator_id=interaction.user.id,
+            channel_id=channel.id,
         )
 
         await interaction.response.send_message(
@@ -884,6 +1066,10 @@ class Moderation(commands.Cog):
                 "MODERATION",
                 f"{interaction.user.name}#{interaction.user.discriminator} "
                 f"purged {amount} messages{details_text} in #{interaction.channel.name}",
+                moderator_id=interaction.user.id,
+                channel_id=interaction.channel.id,
+                amount=amount,
+                user_id=user.id if user else None,
             )
 
             await interaction.followup.send(
@@ -913,6 +1099,10 @@ class Moderation(commands.Cog):
         except Exception as e:
             await ctx.send(f"❌ Erreur: {str(e)}")
 
+    async def cog_unload(self):
+        await self.index.close()
+        await asyncio.to_thread(self.index.storage.close)
+
     async def cog_load(self):
         """Appelé quand le cog est chargé"""
         try:
@@ -2,33 +2,23 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timedelta
-import json
 import asyncio
 import re
 
-REMINDERS_PATH = "/home/app/reminders.json"
-
 
 class Reminders(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.reminders = self.load_reminders()
         self.reminder_tasks = {}
-        # Redémarrer les rappels existants
-        asyncio.create_task(self.start_reminders())
 
-    def load_reminders(self) -> dict:
-        try:
-            with open(REMINDERS_PATH, "r") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            reminders = {}
-            self.save_reminders(reminders)
-            return reminders
+    async def cog_load(self):
+        # Redémarrer les rappels existants
+        await self.start_reminders()
 
-    def save_reminders(self, reminders: dict):
-        with open(REMINDERS_PATH, "w") as f:
-            json.dump(reminders, f, indent=4)
+    async def complete_reminder(self, reminder_id: int):
+        await self.bot.db.execute(
+            "UPDATE reminders SET completed = 1 WHERE id = ?", (reminder_id,)
+        )
 
     def parse_time(self, time_str: str) -> timedelta:
         """Convertit une chaîne de temps (ex: 1h30m) en timedelta"""
@@ -53,27 +43,25 @@ class Reminders(commands.Cog):
 
     async def start_reminders(self):
         """Redémarre tous les rappels au démarrage du bot"""
-        for user_id, user_reminders in self.reminders.items():
-            for reminder_id, reminder in user_reminders.items():
-                if not reminder["completed"]:
-                    time_left = (
-                        datetime.fromisoformat(reminder["end_time"]) - datetime.now()
-                    )
-                    if time_left.total_seconds() > 0:
-                        self.reminder_tasks[reminder_id] = asyncio.create_task(
-                            self.send_reminder(user_id, reminder_id)
-                        )
-
-    async def send_reminder(self, user_id: str, reminder_id: str):
+        for reminder in await self.bot.db.fetchall(
+            "SELECT * FROM reminders WHERE completed = 0"
+        ):
+            time_left = datetime.fromisoformat(reminder["end_time"]) - datetime.now()
+            if time_left.total_seconds() > 0:
+                self.reminder_tasks[reminder["id"]] = asyncio.create_task(
+                    self.send_reminder(reminder)
+                )
+
+    async def send_reminder(self, reminder: dict):
         """Envoie un rappel à l'utilisateur"""
-        reminder = self.reminders[user_id][reminder_id]
+        reminder_id = reminder["id"]
         end_time = datetime.fromisoformat(reminder["end_time"])
 
         # Attendre jusqu'à l'heure du rappel
         await discord.utils.sleep_until(end_time)
 
         try:
-            user = await self.bot.fetch_user(int(user_id))
+            user = await self.bot.fetch_user(reminder["user_id"])
             embed = discord.Embed(
                 title="⏰ Reminder",
                 description=reminder["message"],
@@ -83,8 +71,7 @@ class Reminders(commands.Cog):
             await user.send(embed=embed)
 
             # Marquer comme complété
-            reminder["completed"] = True
-            self.save_reminders(self.reminders)
+            await self.complete_reminder(reminder_id)
 
         except discord.NotFound:
             pass  # Utilisateur introuvable
@@ -111,28 +98,32 @@ class Reminders(commands.Cog):
             )
             return
 
-        user_id = str(interaction.user.id)
-        if user_id not in self.reminders:
-            self.reminders[user_id] = {}
-
         # Créer un nouveau rappel
-        reminder_id = str(len(self.reminders[user_id]) + 1)
         now = datetime.now()
         end_time = now + duration
 
         reminder = {
+            "user_id": interaction.user.id,
             "message": message,
             "created_at": now.isoformat(),
             "end_time": end_time.isoformat(),
-            "completed": False,
+            "completed": 0,
         }
 
-        self.reminders[user_id][reminder_id] = reminder
-        self.save_reminders(self.reminders)
+        reminder["id"] = await self.bot.db.execute(
+            "INSERT INTO reminders (user_id, message, created_at, end_time, completed) "
+            "VALUES (?, ?, ?, ?, 0)",
+            (
+                interaction.user.id,
+                message,
+                reminder["created_at"],
+                reminder["end_time"],
+            ),
+        )
 
         # Démarrer la tâche de rappel
-        self.reminder_tasks[reminder_id] = asyncio.create_task(
-            self.send_reminder(user_id, reminder_id)
+        self.reminder_tasks[reminder["id"]] = asyncio.create_task(
+            self.send_reminder(reminder)
         )
 
         # Envoyer la confirmation
@@ -146,8 +137,11 @@ class Reminders(commands.Cog):
         name="list-reminders", description="List all your active reminders"
     )
     async def list_reminders(self, interaction: discord.Interaction):
-        user_id = str(interaction.user.id)
-        if user_id not in self.reminders or not self.reminders[user_id]:
+        reminders = await self.bot.db.fetchall(
+            "SELECT * FROM reminders WHERE user_id = ? AND completed = 0 ORDER BY id",
+            (interaction.user.id,),
+        )
+        if not reminders:
             await interaction.response.send_message(
                 "You have no reminders set", ephemeral=True
             )
@@ -155,21 +149,20 @@ class Reminders(commands.Cog):
 
         embed = discord.Embed(title="Your Reminders", color=discord.Color.blue())
 
-        for reminder_id, reminder in self.reminders[user_id].items():
-            if not reminder["completed"]:
-                end_time = datetime.fromisoformat(reminder["end_time"])
-                time_left = end_time - datetime.now()
-
-                if time_left.total_seconds() > 0:
-                    embed.add_field(
-                        name=f"Reminder #{reminder_id}",
-                        value=(
-                            f"Message: {reminder['message']}\n"
-                            f"Time left: {str(time_left).split('.')[0]}\n"
-                            f"End time: {end_time.strftime('%Y-%m-%d %H:%M:%S')}"
-                        ),
-                        inline=False,
-                    )
+        for reminder in reminders:
+            end_time = datetime.fromisoformat(reminder["end_time"])
+            time_left = end_time - datetime.now()
+
+            if time_left.total_seconds() > 0:
+                embed.add_field(
+                    name=f"Reminder #{reminder['id']}",
+                    value=(
+                        f"Message: {reminder['message']}\n"
+                        f"Time left: {str(time_left).split('.')[0]}\n"
+                        f"End time: {end_time.strftime('%Y-%m-%d %H:%M:%S')}"
+                    ),
+                    inline=False,
+                )
 
         if not embed.fields:
             await interaction.response.send_message(
@@ -184,26 +177,28 @@ class Reminders(commands.Cog):
     )
     @app_commands.describe(reminder_id="The ID of the reminder to cancel")
     async def cancel_reminder(self, interaction: discord.Interaction, reminder_id: str):
-        user_id = str(interaction.user.id)
+        reminder = None
+        if reminder_id.isdigit():
+            reminder = await self.bot.db.fetchone(
+                "SELECT id FROM reminders WHERE id = ? AND user_id = ? AND completed = 0",
+                (int(reminder_id), interaction.user.id),
+            )
 
-        if (
-            user_id not in self.reminders
-            or reminder_id not in self.reminders[user_id]
-            or self.reminders[user_id][reminder_id]["completed"]
-        ):
+        if not reminder:
             await interaction.response.send_message(
                 "❌ Reminder not found", ephemeral=True
             )
             return
 
+        reminder_id = reminder["id"]
+
         # Annuler la tâche
         if reminder_id in self.reminder_tasks:
             self.reminder_tasks[reminder_id].cancel()
             del self.reminder_tasks[reminder_id]
 
         # Marquer comme complété
-        self.reminders[user_id][reminder_id]["completed"] = True
-        self.save_reminders(self.reminders)
+        await self.complete_reminder(reminder_id)
 
         await interaction.response.send_message("✅ Reminder cancelled", ephemeral=True)
 
@@ -2,18 +2,20 @@ import discord
 from discord.ext import commands
 from datetime import datetime
 
+CHANGES_PATH = "/home/app/changes.txt"
+
 
 class ServerChanges(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    def log_change(self, change_type: str, details: str):
+    def log_change(self, change_type: str, details: str, **fields):
         """Enregistre un changement dans changes.txt"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         log_entry = f"[{timestamp}] [{change_type}] {details}\n"
 
-        with open("changes.txt", "a", encoding="utf-8") as f:
-            f.write(log_entry)
+        self.bot.get_log(CHANGES_PATH).write(log_entry)
+        self.bot.log_event(change_type, details=details, **fields)
 
     @commands.Cog.listener()
     async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
@@ -34,7 +36,9 @@ class ServerChanges(commands.Cog):
             tags = ", ".join(tag.name for tag in channel.available_tags)
             details += f"\nAvailable tags: {tags}"
 
-        self.log_change("CHANNEL_CREATE", details)
+        self.log_change(
+            "CHANNEL_CREATE", details, guild_id=channel.guild.id, channel_id=channel.id
+        )
 
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
@@ -47,7 +51,9 @@ class ServerChanges(commands.Cog):
         if not isinstance(channel, discord.CategoryChannel) and channel.category:
             details += f" from category {channel.category.name}"
 
-        self.log_change("CHANNEL_DELETE", details)
+        self.log_change(
+            "CHANNEL_DELETE", details, guild_id=channel.guild.id, channel_id=channel.id
+        )
 
     @commands.Cog.listener()
     async def on_guild_channel_update(
@@ -101,17 +107,23 @@ class ServerChanges(commands.Cog):
                 f"{channel_type.capitalize()} updated: {after.name} "
                 f"(ID: {after.id})\nChanges:\n- " + "\n- ".join(changes)
             )
-            self.log_change("CHANNEL_UPDATE", details)
+            self.log_change(
+                "CHANNEL_UPDATE",
+                details,
+                guild_id=after.guild.id,
+                channel_id=after.id,
+                changes=changes,
+            )
 
     @commands.Cog.listener()
     async def on_guild_role_create(self, role: discord.Role):
         details = f"New role created: {role.name} (ID: {role.id})"
-        self.log_change("ROLE_CREATE", details)
+        self.log_change("ROLE_CREATE", details, guild_id=role.guild.id, role_id=role.id)
 
     @commands.Cog.listener()
     async def on_guild_role_delete(self, role: discord.Role):
         details = f"Role deleted: {role.name} (ID: {role.id})"
-        self.log_change("ROLE_DELETE", details)
+        self.log_change("ROLE_DELETE", details, guild_id=role.guild.id, role_id=role.id)
 
     @commands.Cog.listener()
     async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
@@ -137,7 +149,13 @@ class ServerChanges(commands.Cog):
                 f"Role updated: {after.name} "
                 f"(ID: {after.id})\nChanges:\n- " + "\n- ".join(changes)
             )
-            self.log_change("ROLE_UPDATE", details)
+            self.log_change(
+                "ROLE_UPDATE",
+                details,
+                guild_id=after.guild.id,
+                role_id=after.id,
+                changes=changes,
+            )
 
     @commands.Cog.listener()
     async def on_member_update(self, before: discord.Member, after: discord.Member):
@@ -148,12 +166,24 @@ class ServerChanges(commands.Cog):
         if added_roles:
             roles = ", ".join(role.name for role in added_roles)
             details = f"User {after.name}#{after.discriminator} (ID: {after.id}) received role(s): {roles}"
-            self.log_change("MEMBER_ROLE_ADD", details)
+            self.log_change(
+                "MEMBER_ROLE_ADD",
+                details,
+                guild_id=after.guild.id,
+                user_id=after.id,
+                role_ids=[role.id for role in added_roles],
+            )
 
         if removed_roles:
             roles = ", ".join(role.name for role in removed_roles)
             details = f"User {after.name}#{after.discriminator} (ID: {after.id}) lost role(s): {roles}"
-            self.log_change("MEMBER_ROLE_REMOVE", details)
+            self.log_change(
+                "MEMBER_ROLE_REMOVE",
+                details,
+                guild_id=after.guild.id,
+                user_id=after.id,
+                role_ids=[role.id for role in removed_roles],
+            )
 
     @commands.Cog.listener()
     async def on_thread_create(self, thread: discord.Thread):
@@ -169,7 +199,13 @@ class ServerChanges(commands.Cog):
                 tags = ", ".join(tag.name for tag in thread.applied_tags)
                 details += f"\nApplied tags: {tags}"
 
-            self.log_change("FORUM_POST_CREATE", details)
+            self.log_change(
+                "FORUM_POST_CREATE",
+                details,
+                guild_id=thread.guild.id,
+                channel_id=thread.parent.id,
+                thread_id=thread.id,
+            )
 
     @commands.Cog.listener()
     async def on_thread_update(self, before: discord.Thread, after: discord.Thread):
@@ -199,7 +235,14 @@ class ServerChanges(commands.Cog):
                     f"in forum {after.parent.name}\n"
                     f"Changes:\n- " + "\n- ".join(changes)
                 )
-                self.log_change("FORUM_POST_UPDATE", details)
+                self.log_change(
+                    "FORUM_POST_UPDATE",
+                    details,
+                    guild_id=after.guild.id,
+                    channel_id=after.parent.id,
+                    thread_id=after.id,
+                    changes=changes,
+                )
 
     @commands.Cog.listener()
     async def on_thread_delete(self, thread: discord.Thread):
@@ -209,7 +252,13 @@ class ServerChanges(commands.Cog):
                 f"(ID: {thread.id}) "
                 f"from forum {thread.parent.name}"
             )
-            self.log_change("FORUM_POST_DELETE", details)
+            self.log_change(
+                "FORUM_POST_DELETE",
+                details,
+                guild_id=thread.guild.id,
+                channel_id=thread.parent.id,
+                thread_id=thread.id,
+            )
 
 
 async def setup(bot):
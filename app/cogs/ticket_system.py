@@ -1,7 +1,310 @@
 import discord
 from discord.ext import commands
+from discord import app_commands
 import asyncio
-import io
+import itertools
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from aiohttp import web
+from typing import Optional
+from utils.channel_pool import ChannelPool
+from utils.log_writer import BatchedWriter
+from utils.scheduler import DeadlineScheduler
+from utils.ticket_metrics import DURATIONS, TicketMetrics, render_prometheus
+from utils.transcript import TranscriptRenderer
+
+# Transcriptions gardées en mémoire jusqu'à 1 Mo, puis écrites sur disque
+TRANSCRIPT_SPOOL_SIZE = 1024 * 1024
+# Place réservée dans chaque upload à l'embed et à l'enveloppe multipart
+TRANSCRIPT_UPLOAD_MARGIN = 64 * 1024
+ARCHIVE_RETENTION_DAYS = 365
+# Période couverte par l'export Prometheus
+METRICS_WINDOW = 7 * 86400
+# Nom des salons cachés de la réserve, en attente d'un ticket
+POOL_CHANNEL_NAME = "ticket-pool"
+
+
+def transcript_record(message: discord.Message) -> dict:
+    """Données d'un message utilisées par les transcriptions texte et HTML"""
+    return {
+        "id": message.id,
+        "bot": message.author.bot,
+        "author_id": message.author.id,
+        "author": message.author.display_name,
+        "author_tag": f"{message.author.name}#{message.author.discriminator}",
+        "avatar": message.author.display_avatar.url,
+        "timestamp": message.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        "content": message.content,
+        "embeds": [
+            {
+                "title": embed.title,
+                "description": embed.description,
+                "fields": [(field.name, field.value) for field in embed.fields],
+            }
+            for embed in message.embeds
+        ],
+        "attachments": [
+            {
+                "filename": attachment.filename,
+                "url": attachment.url,
+                "content_type": attachment.content_type,
+                "size": attachment.size,
+            }
+            for attachment in message.attachments
+        ],
+    }
+
+
+def upload_batches(files: list, limit: int) -> list:
+    """Groupe des fichiers (taille, discord.File) en messages de 10 fichiers
+    au plus, dont la taille totale ne dépasse pas la limite d'upload"""
+    batches, size = [[]], 0
+    for file_size, file in files:
+        if batches[-1] and (len(batches[-1]) == 10 or size + file_size > limit):
+            batches.append([])
+            size = 0
+        batches[-1].append(file)
+        size += file_size
+    return batches
+
+
+async def timed(timings: dict, step: str, awaitable):
+    """Attend awaitable et note sa durée dans timings[step]"""
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[step] = time.perf_counter() - start
+
+
+class TicketStore:
+    """Cache mémoire des tickets, persisté ligne par ligne dans SQLite.
+
+    Les tickets supprimés sont ajoutés à l'archive (table ticket_archive), qui
+    n'est lue que par /ticket-history et purgée selon la durée de rétention.
+    Chaque transition d'état est aussi envoyée à metrics (BatchedWriter vers
+    TicketMetrics) pour les statistiques de délai.
+    """
+
+    def __init__(self, db, metrics: Optional[BatchedWriter] = None):
+        self.db = db
+        self.metrics = metrics
+        self.active_tickets = {}  # {user_id: ticket}
+        self.closed_tickets = {}  # {channel_id: ticket}
+        # Index inverse pour retrouver un ticket depuis son salon
+        self.channels = {}  # {channel_id: user_id}
+        # Utilisateurs dont le salon de ticket est en cours de création
+        self.creating = set()
+
+    async def load(self):
+        for row in await self.db.fetchall("SELECT * FROM tickets"):
+            ticket = {
+                "channel_id": row["channel_id"],
+                "category": row["category"],
+                "status": row["status"],
+                "opened_at": row["opened_at"],
+                "closed_at": row["closed_at"],
+                "fully_captured": bool(row["fully_captured"]),
+            }
+            if row["closed"]:
+                self.closed_tickets[row["channel_id"]] = ticket
+            else:
+                self.active_tickets[str(row["owner_id"])] = ticket
+            self.channels[row["channel_id"]] = str(row["owner_id"])
+
+    def find(self, channel_id: int, closed: bool = False) -> Optional[tuple]:
+        """Retourne (user_id, ticket) du ticket ouvert (ou fermé) d'un salon"""
+        user_id = self.channels.get(channel_id)
+        if user_id is None:
+            return None
+        if closed:
+            ticket = self.closed_tickets.get(channel_id)
+        else:
+            ticket = self.active_tickets.get(user_id)
+        if ticket is None or ticket["channel_id"] != channel_id:
+            return None
+        return user_id, ticket
+
+    def get(self, channel_id: int) -> Optional[dict]:
+        """Ticket ouvert ou fermé d'un salon"""
+        found = self.find(channel_id) or self.find(channel_id, closed=True)
+        return found[1] if found else None
+
+    def record(self, channel_id: int, state: str, actor_id: Optional[int] = None):
+        if self.metrics is not None:
+            self.metrics.write((channel_id, state, time.time(), actor_id))
+
+    def reserve(self, user_id: str) -> bool:
+        """Réserve la création d'un ticket, une seule à la fois par utilisateur.
+
+        Vérification et réservation se font sans await : deux clics simultanés
+        ne peuvent pas réserver tous les deux, et les autres utilisateurs ne
+        sont jamais bloqués. Libérer avec release() une fois le ticket ouvert.
+        """
+        if user_id in self.active_tickets or user_id in self.creating:
+            return False
+        self.creating.add(user_id)
+        return True
+
+    def release(self, user_id: str):
+        self.creating.discard(user_id)
+
+    async def open(self, user_id: str, ticket: dict):
+        ticket.setdefault("opened_at", time.time())
+        ticket.setdefault("closed_at", None)
+        # Salon connu avant son premier message : tout sera enregistré
+        ticket["fully_captured"] = True
+        self.active_tickets[user_id] = ticket
+        self.channels[ticket["channel_id"]] = user_id
+        self.record(ticket["channel_id"], "created", int(user_id))
+        await self.db.execute(
+            "INSERT OR REPLACE INTO tickets "
+            "(channel_id, owner_id, category, status, closed, opened_at, "
+            "fully_captured) VALUES (?, ?, ?, ?, 0, ?, 1)",
+            (
+                ticket["channel_id"],
+                int(user_id),
+                ticket["category"],
+                ticket["status"],
+                ticket["opened_at"],
+            ),
+        )
+
+    async def set_status(self, user_id: str, status: str):
+        ticket = self.active_tickets[user_id]
+        ticket["status"] = status
+        if status == "active":
+            self.record(ticket["channel_id"], "active", int(user_id))
+        await self.db.execute(
+            "UPDATE tickets SET status = ? WHERE channel_id = ?",
+            (status, ticket["channel_id"]),
+        )
+
+    async def close(self, user_id: str, actor_id: Optional[int] = None):
+        ticket = self.active_tickets.pop(user_id)
+        ticket["closed_at"] = time.time()
+        self.closed_tickets[ticket["channel_id"]] = ticket
+        self.record(ticket["channel_id"], "closed", actor_id)
+        await self.db.execute(
+            "UPDATE tickets SET closed = 1, closed_at = ? WHERE channel_id = ?",
+            (ticket["closed_at"], ticket["channel_id"]),
+        )
+
+    async def reopen(self, channel_id: int, actor_id: Optional[int] = None):
+        ticket = self.closed_tickets.pop(channel_id)
+        ticket["closed_at"] = None
+        self.active_tickets[self.channels[channel_id]] = ticket
+        self.record(channel_id, "reopened", actor_id)
+        await self.db.execute(
+            "UPDATE tickets SET closed = 0, closed_at = NULL WHERE channel_id = ?",
+            (channel_id,),
+        )
+
+    async def delete(self, channel_id: int, channel_name: str, deleted_by: int):
+        """Supprime un ticket et l'ajoute à l'archive s'il était fermé"""
+        user_id = self.channels.pop(channel_id, None)
+        ticket = self.closed_tickets.pop(channel_id, None)
+        active = self.active_tickets.get(user_id)
+        if active is not None and active["channel_id"] == channel_id:
+            del self.active_tickets[user_id]
+        if user_id is not None:
+            self.record(channel_id, "deleted", deleted_by)
+
+        if ticket is not None:
+            await self.db.execute(
+                "INSERT INTO ticket_archive (channel_id, channel_name, owner_id, "
+                "category, opened_at, closed_at, deleted_by) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    channel_id,
+                    channel_name,
+                    int(user_id),
+                    ticket["category"],
+                    ticket["opened_at"],
+                    ticket["closed_at"] or time.time(),
+                    deleted_by,
+                ),
+            )
+        await self.db.execute("DELETE FROM tickets WHERE channel_id = ?", (channel_id,))
+        await self.db.execute(
+            "DELETE FROM ticket_messages WHERE channel_id = ?", (channel_id,)
+        )
+
+    async def capture(self, channel_id: int, record: dict):
+        """Enregistre (ou met à jour) un message pour la transcription"""
+        await self.db.execute(
+            "INSERT OR REPLACE INTO ticket_messages (channel_id, message_id, data) "
+            "VALUES (?, ?, ?)",
+            (channel_id, record["id"], json.dumps(record, separators=(",", ":"))),
+        )
+
+    async def capture_many(self, channel_id: int, records: list):
+        await self.db.executemany(
+            "INSERT OR REPLACE INTO ticket_messages (channel_id, message_id, data) "
+            "VALUES (?, ?, ?)",
+            [
+                (channel_id, record["id"], json.dumps(record, separators=(",", ":")))
+                for record in records
+            ],
+        )
+
+    async def mark_captured(self, channel_id: int):
+        """Tout l'historique du salon est enregistré (après un rattrapage)"""
+        ticket = self.get(channel_id)
+        if ticket is not None:
+            ticket["fully_captured"] = True
+        await self.db.execute(
+            "UPDATE tickets SET fully_captured = 1 WHERE channel_id = ?", (channel_id,)
+        )
+
+    async def captured(self, channel_id: int) -> list:
+        """Messages enregistrés d'un ticket, du plus ancien au plus récent"""
+        rows = await self.db.fetchall(
+            "SELECT data FROM ticket_messages WHERE channel_id = ? ORDER BY message_id",
+            (channel_id,),
+        )
+        return [json.loads(row["data"]) for row in rows]
+
+    async def last_activity(self) -> dict:
+        """Date du dernier message d'un membre (hors bots) par ticket enregistré"""
+        rows = await self.db.fetchall(
+            "SELECT channel_id, MAX(message_id) AS message_id FROM ticket_messages "
+            "WHERE json_extract(data, '$.bot') = 0 GROUP BY channel_id"
+        )
+        return {
+            row["channel_id"]: discord.utils.snowflake_time(
+                row["message_id"]
+            ).timestamp()
+            for row in rows
+        }
+
+    async def history(self, owner_id: int, limit: int = 25) -> list:
+        """Tickets archivés d'un utilisateur, du plus récent au plus ancien"""
+        return await self.db.fetchall(
+            "SELECT * FROM ticket_archive WHERE owner_id = ? "
+            "ORDER BY closed_at DESC LIMIT ?",
+            (owner_id, limit),
+        )
+
+    def open_counts(self) -> dict:
+        """Nombre de tickets ouverts par statut, et de tickets fermés"""
+        counts = {"waiting_description": 0, "active": 0}
+        for ticket in self.active_tickets.values():
+            counts[ticket["status"]] = counts.get(ticket["status"], 0) + 1
+        counts["closed"] = len(self.closed_tickets)
+        return counts
+
+    async def purge_archive(self, retention_days: Optional[int]):
+        """Supprime les tickets archivés plus vieux que la durée de rétention"""
+        if not retention_days:
+            return
+        await self.db.execute(
+            "DELETE FROM ticket_archive WHERE closed_at < ?",
+            (time.time() - retention_days * 86400,),
+        )
 
 
 class TicketSetupView(discord.ui.View):
@@ -71,7 +374,7 @@ class TicketChannelModal(discord.ui.Modal, title="Ticket Message Channel Setup")
                 return
 
             self.bot.config["tickets"]["message_channel_id"] = channel_id
-            self.bot.save_config()
+            self.bot.save_config("tickets")
 
             # Create the ticket message
             view = TicketCreateView(self.bot)
@@ -111,7 +414,7 @@ class SupportRoleModal(discord.ui.Modal, title="Support Role Setup"):
                 return
 
             self.bot.config["tickets"]["support_role_id"] = role_id
-            self.bot.save_config()
+            self.bot.save_config("tickets")
             await interaction.response.send_message(
                 f"✅ Support role set to {role.mention}!", ephemeral=True
             )
@@ -141,7 +444,7 @@ class TicketCategoryModal(discord.ui.Modal, title="Ticket Category Setup"):
                 return
 
             self.bot.config["tickets"]["category_id"] = category_id
-            self.bot.save_config()
+            self.bot.save_config("tickets")
             await interaction.response.send_message(
                 f"✅ Ticket category set to: {category.name}", ephemeral=True
             )
@@ -162,9 +465,10 @@ class TicketCreateView(discord.ui.View):
     async def create_ticket(
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
-        # Check if user already has an active ticket
-        active_tickets = self.bot.config["tickets"]["active_tickets"]
-        if str(interaction.user.id) in active_tickets:
+        # Check if user already has an active ticket (or one being created)
+        tickets = self.bot.get_cog("TicketSystem").tickets
+        user_id = str(interaction.user.id)
+        if user_id in tickets.active_tickets or user_id in tickets.creating:
             await interaction.response.send_message(
                 "❌ You already have an active ticket!", ephemeral=True
             )
@@ -193,6 +497,39 @@ class TicketCreateView(discord.ui.View):
     async def create_ticket_channel(
         self, interaction: discord.Interaction, category: str
     ):
+        # Un seul salon par utilisateur, même si la sélection est envoyée plusieurs fois
+        cog = self.bot.get_cog("TicketSystem")
+        tickets = cog.tickets
+        user_id = str(interaction.user.id)
+        if not tickets.reserve(user_id):
+            await interaction.response.send_message(
+                "❌ You already have an active ticket!", ephemeral=True
+            )
+            return
+
+        try:
+            await self._create_ticket_channel(interaction, category, cog)
+        finally:
+            tickets.release(user_id)
+
+    async def _create_ticket_channel(
+        self, interaction: discord.Interaction, category: str, cog
+    ):
+        """Crée le salon du ticket après avoir différé la réponse.
+
+        Seule la création du salon précède le reste : l'enregistrement, le
+        message épinglé et la confirmation partent ensuite en parallèle. La
+        durée de chaque étape est affichée dans la console.
+        """
+        timings = {}
+        start = time.perf_counter()
+        # Répondre tout de suite : le délai de 3 secondes ne dépend plus de l'API
+        await timed(
+            timings,
+            "defer",
+            interaction.response.defer(ephemeral=True, thinking=True),
+        )
+
         # Create the channel in the configured category
         category_channel = interaction.guild.get_channel(
             self.bot.config["tickets"].get("category_id")
@@ -212,19 +549,35 @@ class TicketCreateView(discord.ui.View):
             ): discord.PermissionOverwrite(read_messages=True, send_messages=True),
         }
 
-        channel = await interaction.guild.create_text_channel(
-            name=f"ticket-{interaction.user.name}",
-            category=category_channel,
-            overwrites=overwrites,
-        )
-
-        # Save ticket info
-        self.bot.config["tickets"]["active_tickets"][str(interaction.user.id)] = {
-            "channel_id": channel.id,
-            "category": category,
-            "status": "waiting_description",
-        }
-        self.bot.save_config()
+        try:
+            # Un salon de la réserve ne demande qu'un appel (nom + permissions)
+            channel = cog.pool.claim()
+            if channel is not None:
+                await timed(
+                    timings,
+                    "channel",
+                    channel.edit(
+                        name=f"ticket-{interaction.user.name}",
+                        category=category_channel,
+                        overwrites=overwrites,
+                    ),
+                )
+            else:
+                channel = await timed(
+                    timings,
+                    "channel",
+                    interaction.guild.create_text_channel(
+                        name=f"ticket-{interaction.user.name}",
+                        category=category_channel,
+                        overwrites=overwrites,
+                    ),
+                )
+        except discord.HTTPException as e:
+            print(f"✗ Erreur création du ticket: {str(e)}")
+            await interaction.followup.send(
+                "❌ Could not create the ticket channel!", ephemeral=True
+            )
+            return
 
         # Log de création du ticket
         if self.bot.config["logs"]["ticket"]["events"]["ticket_create"]:
@@ -232,6 +585,9 @@ class TicketCreateView(discord.ui.View):
                 "TICKET_CREATE",
                 f"Ticket created by {interaction.user.name}#{interaction.user.discriminator} (ID: {interaction.user.id}) "
                 f"in category '{category}' - Channel: {channel.name}",
+                user_id=interaction.user.id,
+                channel_id=channel.id,
+                category=category,
             )
 
         # Send initial message
@@ -241,14 +597,56 @@ class TicketCreateView(discord.ui.View):
             color=discord.Color.blue(),
         )
 
-        view = TicketControlView(self.bot)
-        message = await channel.send(
-            content=f"{interaction.user.mention}", embed=embed, view=view
+        async def send_initial_message():
+            view = TicketControlView(self.bot)
+            message = await timed(
+                timings,
+                "send",
+                channel.send(
+                    content=f"{interaction.user.mention}", embed=embed, view=view
+                ),
+            )
+            await timed(timings, "pin", message.pin())
+
+        # Save ticket info (en premier : le salon est connu avant le premier message)
+        await asyncio.gather(
+            timed(
+                timings,
+                "persist",
+                cog.tickets.open(
+                    str(interaction.user.id),
+                    {
+                        "channel_id": channel.id,
+                        "category": category,
+                        "status": "waiting_description",
+                    },
+                ),
+            ),
+            send_initial_message(),
+            timed(
+                timings,
+                "followup",
+                interaction.followup.send(
+                    f"✅ Ticket created! Check {channel.mention}", ephemeral=True
+                ),
+            ),
         )
-        await message.pin()
 
-        await interaction.response.send_message(
-            f"✅ Ticket created! Check {channel.mention}", ephemeral=True
+        cog.touch(channel.id)
+        timings["total"] = time.perf_counter() - start
+        print(
+            f"Ticket {channel.name} créé : "
+            + ", ".join(
+                f"{step} {seconds * 1000:.0f} ms" for step, seconds in timings.items()
+            )
+        )
+        self.bot.log_event(
+            "TICKET_CREATE_LATENCY",
+            channel_id=channel.id,
+            **{
+                f"{step}_ms": round(seconds * 1000, 1)
+                for step, seconds in timings.items()
+            },
         )
 
 
@@ -268,12 +666,9 @@ class TicketControlView(discord.ui.View):
             interaction.user.get_role(self.bot.config["tickets"]["support_role_id"])
             is not None
         )
-        is_owner = False
-
-        for user_id, ticket in self.bot.config["tickets"]["active_tickets"].items():
-            if ticket["channel_id"] == interaction.channel.id:
-                is_owner = str(interaction.user.id) == user_id
-                break
+        tickets = self.bot.get_cog("TicketSystem").tickets
+        found = tickets.find(interaction.channel.id)
+        is_owner = found is not None and found[0] == str(interaction.user.id)
 
         if not (is_support or is_owner):
             await interaction.response.send_message(
@@ -281,25 +676,10 @@ class TicketControlView(discord.ui.View):
             )
             return
 
-        # Remove access for the ticket owner
-        for user_id, ticket in self.bot.config["tickets"]["active_tickets"].items():
-            if ticket["channel_id"] == interaction.channel.id:
-                user = interaction.guild.get_member(int(user_id))
-                await interaction.channel.set_permissions(user, read_messages=False)
-
-                # Move to closed tickets
-                self.bot.config["tickets"]["closed_tickets"][user_id] = ticket
-                del self.bot.config["tickets"]["active_tickets"][user_id]
-                self.bot.save_config()
-
-                # Log de fermeture du ticket
-                if self.bot.config["logs"]["ticket"]["events"]["ticket_close"]:
-                    self.bot.log_to_file(
-                        "TICKET_CLOSE",
-                        f"Ticket '{interaction.channel.name}' closed by {interaction.user.name}#{interaction.user.discriminator} "
-                        f"(ID: {interaction.user.id}) - Owner: {user.name}#{user.discriminator}",
-                    )
-                break
+        if found:
+            await self.bot.get_cog("TicketSystem").close_ticket(
+                interaction.channel, found[0], interaction.user
+            )
 
         # Update the view
         view = ClosedTicketView(self.bot)
@@ -325,58 +705,118 @@ class ClosedTicketView(discord.ui.View):
             return
 
         # Find ticket owner
-        for user_id, ticket in self.bot.config["tickets"]["closed_tickets"].items():
-            if ticket["channel_id"] == interaction.channel.id:
-                user = interaction.guild.get_member(int(user_id))
-                await interaction.channel.set_permissions(
-                    user, read_messages=True, send_messages=True
-                )
+        tickets = self.bot.get_cog("TicketSystem").tickets
+        found = tickets.find(interaction.channel.id, closed=True)
+        if found:
+            user_id, ticket = found
+            user = interaction.guild.get_member(int(user_id))
+            await interaction.channel.set_permissions(
+                user, read_messages=True, send_messages=True
+            )
 
-                # Move back to active tickets
-                self.bot.config["tickets"]["active_tickets"][user_id] = ticket
-                del self.bot.config["tickets"]["closed_tickets"][user_id]
-                self.bot.save_config()
-
-                # Log de réouverture du ticket
-                if self.bot.config["logs"]["ticket"]["events"][
-                    "ticket_close"
-                ]:  # On utilise le même événement que la fermeture
-                    self.bot.log_to_file(
-                        "TICKET_REOPEN",
-                        f"Ticket '{interaction.channel.name}' reopened by {interaction.user.name}#{interaction.user.discriminator} "
-                        f"(ID: {interaction.user.id}) - Owner: {user.name}#{user.discriminator}",
-                    )
-                break
+            # Move back to active tickets
+            await tickets.reopen(interaction.channel.id, interaction.user.id)
+            self.bot.get_cog("TicketSystem").touch(interaction.channel.id)
+
+            # Log de réouverture du ticket
+            if self.bot.config["logs"]["ticket"]["events"][
+                "ticket_close"
+            ]:  # On utilise le même événement que la fermeture
+                self.bot.log_to_file(
+                    "TICKET_REOPEN",
+                    f"Ticket '{interaction.channel.name}' reopened by {interaction.user.name}#{interaction.user.discriminator} "
+                    f"(ID: {interaction.user.id}) - Owner: {user.name}#{user.discriminator}",
+                    user_id=interaction.user.id,
+                    owner_id=int(user_id),
+                    channel_id=interaction.channel.id,
+                )
 
         # Update the view
         view = TicketControlView(self.bot)
         await interaction.message.edit(view=view)
         await interaction.response.send_message("Ticket reopened", ephemeral=True)
 
-    async def create_transcript(self, channel: discord.TextChannel) -> discord.File:
-        messages = []
-        async for message in channel.history(limit=None, oldest_first=True):
+    async def create_transcript(self, channel: discord.TextChannel) -> list:
+        """Écrit les transcriptions texte et HTML du ticket.
+
+        Les messages sont enregistrés au fil de l'eau par TicketSystem.on_message ;
+        TicketSystem.backfill ne demande à l'API que ceux qui manquent. Le texte est découpé en parties ne dépassant pas la limite
+        d'upload du serveur ; le rendu HTML (gzip) se fait par lots dans un thread.
+        Retourne les fichiers (taille, discord.File) : le HTML en premier, s'il
+        tient dans la limite, puis les parties texte.
+        """
+        cog = self.bot.get_cog("TicketSystem")
+        records = await cog.backfill(channel)
+
+        limit = channel.guild.filesize_limit - TRANSCRIPT_UPLOAD_MARGIN
+        parts = [tempfile.SpooledTemporaryFile(max_size=TRANSCRIPT_SPOOL_SIZE)]
+        transcript = await asyncio.to_thread(
+            cog.renderer.open, f"Ticket {channel.name}"
+        )
+        batch = []
+
+        for record in records:
             if (
-                message.author.bot and not message.embeds
+                record["bot"] and not record["embeds"]
             ):  # Ignorer les messages du bot sauf les embeds
                 continue
 
-            timestamp = message.created_at.strftime("%Y-%m-%d %H:%M:%S")
-            if message.embeds:
-                for embed in message.embeds:
-                    messages.append(
-                        f"[{timestamp}] [EMBED] {embed.title}: {embed.description}"
-                    )
+            timestamp = record["timestamp"]
+            if record["embeds"]:
+                lines = [
+                    f"[{timestamp}] [EMBED] {embed['title']}: {embed['description']}\n"
+                    for embed in record["embeds"]
+                ]
             else:
-                messages.append(
-                    f"[{timestamp}] {message.author.name}#{message.author.discriminator}: {message.content}"
+                lines = [f"[{timestamp}] {record['author_tag']}: {record['content']}\n"]
+
+            for line in lines:
+                data = line.encode("utf-8")
+                # Commencer une nouvelle partie avant de dépasser la limite
+                if parts[-1].tell() and parts[-1].tell() + len(data) > limit:
+                    parts.append(
+                        tempfile.SpooledTemporaryFile(max_size=TRANSCRIPT_SPOOL_SIZE)
+                    )
+                parts[-1].write(data)
+
+            batch.append(record)
+            if len(batch) >= 100:
+                await asyncio.to_thread(transcript.write, batch)
+                batch = []
+
+        if batch:
+            await asyncio.to_thread(transcript.write, batch)
+        html_file = await asyncio.to_thread(transcript.finish)
+
+        files = []
+        html_size = html_file.seek(0, 2)
+        if html_size <= limit:
+            html_file.seek(0)
+            files.append(
+                (
+                    html_size,
+                    discord.File(
+                        fp=html_file, filename=f"transcript-{channel.name}.html.gz"
+                    ),
                 )
-
-        transcript_text = "\n".join(messages)
-        transcript_file = discord.File(
-            fp=io.StringIO(transcript_text), filename=f"transcript-{channel.name}.txt"
-        )
-        return transcript_file
+            )
+        else:
+            html_file.close()
+            print(f"✗ Transcription HTML de {channel.name} trop volumineuse, ignorée")
+
+        for index, part in enumerate(parts, 1):
+            size = part.tell()
+            part.seek(0)
+            suffix = f"-part{index}" if len(parts) > 1 else ""
+            files.append(
+                (
+                    size,
+                    discord.File(
+                        fp=part, filename=f"transcript-{channel.name}{suffix}.txt"
+                    ),
+                )
+            )
+        return files
 
     @discord.ui.button(
         label="Delete", style=discord.ButtonStyle.danger, custom_id="delete_ticket"
@@ -390,8 +830,11 @@ class ClosedTicketView(discord.ui.View):
             )
             return
 
-        # Créer la transcription
-        transcript_file = await self.create_transcript(interaction.channel)
+        tickets = self.bot.get_cog("TicketSystem").tickets
+        # Trouver les informations du ticket
+        found = tickets.find(interaction.channel.id, closed=True)
+        ticket_info = found[1] if found else None
+        ticket_owner = interaction.guild.get_member(int(found[0])) if found else None
 
         # Envoyer la transcription si un salon est configuré
         if self.bot.config["tickets"]["transcript_channel_id"]:
@@ -399,16 +842,14 @@ class ClosedTicketView(discord.ui.View):
                 self.bot.config["tickets"]["transcript_channel_id"]
             )
             if transcript_channel:
-                # Trouver les informations du ticket
-                ticket_info = None
-                ticket_owner = None
-                for user_id, ticket in self.bot.config["tickets"][
-                    "closed_tickets"
-                ].items():
-                    if ticket["channel_id"] == interaction.channel.id:
-                        ticket_info = ticket
-                        ticket_owner = interaction.guild.get_member(int(user_id))
-                        break
+                # Créer la transcription
+                transcript_files = await self.create_transcript(interaction.channel)
+                # La limite d'upload s'applique à la requête entière : HTML et
+                # parties texte sont comptés dans le même budget par message
+                batches = upload_batches(
+                    transcript_files,
+                    interaction.guild.filesize_limit - TRANSCRIPT_UPLOAD_MARGIN,
+                )
 
                 embed = discord.Embed(
                     title="Ticket Transcript",
@@ -420,25 +861,45 @@ class ClosedTicketView(discord.ui.View):
                     timestamp=interaction.created_at,
                 )
 
-                await transcript_channel.send(embed=embed, file=transcript_file)
+                try:
+                    for index, batch in enumerate(batches):
+                        await transcript_channel.send(
+                            embed=embed if index == 0 else None, files=batch
+                        )
+                except discord.HTTPException as e:
+                    # Une transcription non envoyée n'empêche pas la suppression
+                    print(
+                        f"✗ Erreur envoi transcription {interaction.channel.name}: {str(e)}"
+                    )
+                finally:
+                    for transcript_file in itertools.chain(*batches):
+                        transcript_file.close()
+                        transcript_file.fp.close()
 
         # Log de suppression du ticket
-        if self.bot.config["logs"]["ticket"]["events"]["ticket_delete"]:
-            for user_id, ticket in self.bot.config["tickets"]["closed_tickets"].items():
-                if ticket["channel_id"] == interaction.channel.id:
-                    ticket_owner = interaction.guild.get_member(int(user_id))
-                    self.bot.log_to_file(
-                        "TICKET_DELETE",
-                        f"Ticket '{interaction.channel.name}' deleted by {interaction.user.name}#{interaction.user.discriminator} "
-                        f"(ID: {interaction.user.id}) - Owner: {ticket_owner.name}#{ticket_owner.discriminator}",
-                    )
-                    break
+        if found and self.bot.config["logs"]["ticket"]["events"]["ticket_delete"]:
+            self.bot.log_to_file(
+                "TICKET_DELETE",
+                f"Ticket '{interaction.channel.name}' deleted by {interaction.user.name}#{interaction.user.discriminator} "
+                f"(ID: {interaction.user.id}) - Owner: {ticket_owner.name}#{ticket_owner.discriminator}",
+                user_id=interaction.user.id,
+                owner_id=int(found[0]),
+                channel_id=interaction.channel.id,
+            )
 
         await interaction.response.send_message(
             "Channel will be deleted in 5 seconds...", ephemeral=True
         )
         await asyncio.sleep(5)
         await interaction.channel.delete()
+        await tickets.delete(
+            interaction.channel.id, interaction.channel.name, interaction.user.id
+        )
+        await tickets.purge_archive(
+            self.bot.config["tickets"].get(
+                "archive_retention_days", ARCHIVE_RETENTION_DAYS
+            )
+        )
 
 
 class CategoryManageView(discord.ui.View):
@@ -469,7 +930,7 @@ class CategoryManageView(discord.ui.View):
         async def select_callback(interaction: discord.Interaction):
             category = select.values[0]
             del self.bot.config["tickets"]["categories"][category]
-            self.bot.save_config()
+            self.bot.save_config("tickets")
             await interaction.response.send_message(
                 f"✅ Category '{category}' removed!", ephemeral=True
             )
@@ -504,7 +965,7 @@ class AddCategoryModal(discord.ui.Modal, title="Add Ticket Category"):
             return
 
         self.bot.config["tickets"]["categories"][name] = emoji
-        self.bot.save_config()
+        self.bot.save_config("tickets")
 
         # Update ticket message if it exists
         if self.bot.config["tickets"]["message_channel_id"]:
@@ -548,7 +1009,7 @@ class TranscriptChannelModal(discord.ui.Modal, title="Transcript Channel Setup")
                 return
 
             self.bot.config["tickets"]["transcript_channel_id"] = channel_id
-            self.bot.save_config()
+            self.bot.save_config("tickets")
             await interaction.response.send_message(
                 f"✅ Transcript channel set to {channel.mention}!", ephemeral=True
             )
@@ -559,37 +1020,373 @@ class TranscriptChannelModal(discord.ui.Modal, title="Transcript Channel Setup")
 class TicketSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.metrics = BatchedWriter(TicketMetrics())
+        self.tickets = TicketStore(bot.db, self.metrics)
+        self.metrics_runner: Optional[web.AppRunner] = None
+        self.pool = ChannelPool(
+            self.create_pool_channel,
+            bot.config["tickets"].get("channel_pool_size", 0),
+        )
+        self.pool_adopted = False
+        # Inactivité des tickets ouverts : un seul minuteur pour tous les salons
+        self.last_activity = {}  # {channel_id: timestamp}
+        self.idle_warned = set()
+        self.idle = DeadlineScheduler(self.check_idle)
+        self.renderer = TranscriptRenderer(TRANSCRIPT_SPOOL_SIZE)
         # Réinitialiser les vues persistantes
         self.bot.add_view(TicketCreateView(bot))
         self.bot.add_view(TicketControlView(bot))
         self.bot.add_view(ClosedTicketView(bot))
 
+    async def cog_load(self):
+        await self.tickets.load()
+        await self.tickets.purge_archive(
+            self.bot.config["tickets"].get(
+                "archive_retention_days", ARCHIVE_RETENTION_DAYS
+            )
+        )
+        await self.start_metrics_server()
+
+    async def cog_unload(self):
+        await self.idle.close()
+        await self.pool.close()
+        if self.metrics_runner is not None:
+            await self.metrics_runner.cleanup()
+        await self.metrics.close()
+        await asyncio.to_thread(self.metrics.storage.close)
+
+    async def close_ticket(
+        self, channel: discord.TextChannel, user_id: str, closed_by: discord.abc.User
+    ):
+        """Ferme un ticket ouvert : bouton Close ou fermeture automatique"""
+        # Remove access for the ticket owner
+        user = channel.guild.get_member(int(user_id))
+        if user is not None:
+            await channel.set_permissions(user, read_messages=False)
+
+        # Move to closed tickets
+        await self.tickets.close(user_id, closed_by.id)
+        self.idle.cancel(channel.id)
+        self.last_activity.pop(channel.id, None)
+        self.idle_warned.discard(channel.id)
+
+        # Log de fermeture du ticket
+        if self.bot.config["logs"]["ticket"]["events"]["ticket_close"]:
+            owner = f"{user.name}#{user.discriminator}" if user else user_id
+            self.bot.log_to_file(
+                "TICKET_CLOSE",
+                f"Ticket '{channel.name}' closed by {closed_by.name}#{closed_by.discriminator} "
+                f"(ID: {closed_by.id}) - Owner: {owner}",
+                user_id=closed_by.id,
+                owner_id=int(user_id),
+                channel_id=channel.id,
+            )
+
+    def idle_delays(self) -> Optional[tuple]:
+        """(avertissement, fermeture) en secondes d'inactivité, None si désactivé"""
+        config = self.bot.config["tickets"]
+        close_after = (config.get("idle_close_hours") or 0) * 3600
+        if not close_after:
+            return None
+        warning = (config.get("idle_warning_hours") or 0) * 3600
+        return max(close_after - warning, 0), close_after
+
+    def touch(self, channel_id: int, when: Optional[float] = None):
+        """Note une activité dans un ticket ouvert (O(1), sans toucher au tas)"""
+        delays = self.idle_delays()
+        if delays is None:
+            return
+        self.last_activity[channel_id] = when or time.time()
+        # L'échéance existante est repoussée quand elle expire (check_idle)
+        if channel_id not in self.idle:
+            self.idle.schedule(channel_id, self.last_activity[channel_id] + delays[0])
+
+    async def check_idle(self, channel_id: int):
+        """Échéance d'un ticket : reprogrammer, avertir ou fermer"""
+        delays = self.idle_delays()
+        found = self.tickets.find(channel_id)
+        channel = self.bot.get_channel(channel_id)
+        if delays is None or found is None or channel is None:
+            self.last_activity.pop(channel_id, None)
+            self.idle_warned.discard(channel_id)
+            return
+
+        warn_after, close_after = delays
+        last = self.last_activity.get(channel_id, time.time())
+        idle = time.time() - last
+        if idle < warn_after:
+            # Activité depuis la programmation de l'échéance
+            self.idle_warned.discard(channel_id)
+            self.idle.schedule(channel_id, last + warn_after)
+        elif channel_id not in self.idle_warned:
+            self.idle_warned.add(channel_id)
+            # Laisser tout le délai d'avertissement, même après un redémarrage
+            closes_at = max(last + close_after, time.time() + close_after - warn_after)
+            self.idle.schedule(channel_id, closes_at)
+            await channel.send(
+                f"<@{found[0]}> This ticket has been inactive and will be closed "
+                f"<t:{int(closes_at)}:R> unless someone replies."
+            )
+        elif idle < close_after:
+            self.idle.schedule(channel_id, last + close_after)
+        else:
+            await self.close_ticket(channel, found[0], self.bot.user)
+            await channel.send(
+                "Ticket closed automatically due to inactivity.",
+                view=ClosedTicketView(self.bot),
+            )
+
+    async def create_pool_channel(self) -> Optional[discord.TextChannel]:
+        """Crée un salon caché dans la catégorie des tickets pour la réserve"""
+        category = self.bot.get_channel(self.bot.config["tickets"].get("category_id"))
+        if not isinstance(category, discord.CategoryChannel):
+            return None
+        return await category.guild.create_text_channel(
+            name=POOL_CHANNEL_NAME,
+            category=category,
+            overwrites={
+                category.guild.default_role: discord.PermissionOverwrite(
+                    read_messages=False
+                )
+            },
+        )
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Programmer la fermeture des tickets ouverts, depuis leur dernier message
+        if self.idle_delays() is not None and not self.idle:
+            last_activity = await self.tickets.last_activity()
+            for user_id, ticket in self.tickets.active_tickets.items():
+                self.touch(
+                    ticket["channel_id"],
+                    max(
+                        last_activity.get(ticket["channel_id"], 0),
+                        ticket["opened_at"] or time.time(),
+                    ),
+                )
+
+        # Reprendre les salons de réserve existants avant d'en créer d'autres
+        if not self.pool_adopted:
+            self.pool_adopted = True
+            category = self.bot.get_channel(
+                self.bot.config["tickets"].get("category_id")
+            )
+            if isinstance(category, discord.CategoryChannel):
+                self.pool.adopt(
+                    channel
+                    for channel in category.text_channels
+                    if channel.name == POOL_CHANNEL_NAME
+                    and channel.id not in self.tickets.channels
+                )
+        self.pool.refill()
+
+        # Rattraper les messages postés pendant un arrêt du bot, et l'historique
+        # des tickets ouverts avant l'enregistrement des messages
+        for channel_id in list(self.tickets.channels):
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                continue
+            try:
+                await self.backfill(channel)
+            except discord.HTTPException as e:
+                print(f"✗ Erreur rattrapage des messages de {channel.name}: {str(e)}")
+
+    async def backfill(self, channel: discord.TextChannel) -> list:
+        """Enregistre les messages manqués d'un ticket et retourne tous ses
+        messages, du plus ancien au plus récent.
+
+        Pour un ticket enregistré depuis sa création, seuls les messages
+        postérieurs au dernier enregistré manquent (bot arrêté) ; sinon tout
+        l'historique est relu, une seule fois.
+        """
+        records = await self.tickets.captured(channel.id)
+        ticket = self.tickets.get(channel.id)
+        complete = ticket is not None and ticket["fully_captured"]
+        after = discord.Object(id=records[-1]["id"]) if complete and records else None
+        missed = [
+            transcript_record(message)
+            async for message in channel.history(
+                limit=None, after=after, oldest_first=True
+            )
+        ]
+        if missed:
+            await self.tickets.capture_many(channel.id, missed)
+        if ticket is not None and not complete:
+            await self.tickets.mark_captured(channel.id)
+
+        merged = {record["id"]: record for record in records}
+        merged.update((record["id"], record) for record in missed)
+        return sorted(merged.values(), key=lambda record: record["id"])
+
+    async def start_metrics_server(self):
+        """Expose /metrics au format Prometheus si METRICS_PORT est défini"""
+        port = os.getenv("METRICS_PORT")
+        if not port:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self.prometheus_metrics)
+        self.metrics_runner = web.AppRunner(app)
+        await self.metrics_runner.setup()
+        try:
+            await web.TCPSite(self.metrics_runner, "0.0.0.0", int(port)).start()
+            print(f"✓ Métriques des tickets exposées sur le port {port}")
+        except (OSError, ValueError) as e:
+            print(f"✗ Erreur serveur de métriques: {str(e)}")
+            await self.metrics_runner.cleanup()
+            self.metrics_runner = None
+
+    async def prometheus_metrics(self, request: web.Request) -> web.Response:
+        stats = await asyncio.to_thread(
+            self.metrics.storage.stats, time.time() - METRICS_WINDOW
+        )
+        return web.Response(
+            text=render_prometheus(
+                stats, self.tickets.open_counts(), self.pool.stats()
+            ),
+            content_type="text/plain",
+            charset="utf-8",
+        )
+
+    @app_commands.command(
+        name="ticket-stats", description="View ticket response and handling times"
+    )
+    @app_commands.describe(days="Number of days to include (default: 7)")
+    @app_commands.default_permissions(administrator=True)
+    async def ticket_stats(
+        self,
+        interaction: discord.Interaction,
+        days: app_commands.Range[int, 1, 365] = 7,
+    ):
+        stats = await asyncio.to_thread(
+            self.metrics.storage.stats, time.time() - days * 86400
+        )
+
+        def format_duration(seconds: Optional[float]) -> str:
+            if seconds is None:
+                return "-"
+            minutes, seconds = divmod(int(seconds), 60)
+            hours, minutes = divmod(minutes, 60)
+            if hours:
+                return f"{hours}h {minutes:02d}m"
+            return f"{minutes}m {seconds:02d}s"
+
+        counts = stats["counts"]
+        open_counts = self.tickets.open_counts()
+        embed = discord.Embed(
+            title="Ticket Statistics",
+            description=f"Last {days} day(s)\n"
+            f"Created: {counts['created']} - Closed: {counts['closed']} - "
+            f"Deleted: {counts['deleted']} - Reopened: {counts['reopened']}\n"
+            f"Open now: {open_counts['waiting_description']} waiting, "
+            f"{open_counts['active']} active, {open_counts['closed']} closed",
+            color=discord.Color.blue(),
+        )
+        for name, _, _, description in DURATIONS:
+            summary = stats["durations"][name]
+            embed.add_field(
+                name=description,
+                value=f"p50: {format_duration(summary[0.5])}\n"
+                f"p90: {format_duration(summary[0.9])}\n"
+                f"p99: {format_duration(summary[0.99])}\n"
+                f"({summary['count']} tickets)",
+                inline=True,
+            )
+        pool = self.pool.stats()
+        if pool["size"]:
+            hit_rate = (
+                f"{pool['hit_rate']:.0%}" if pool["hit_rate"] is not None else "-"
+            )
+            embed.add_field(
+                name="Channel Pool",
+                value=f"Ready: {pool['ready']}/{pool['size']}\n"
+                f"Hit rate: {hit_rate} ({pool['hits']} hits, {pool['misses']} misses)",
+                inline=False,
+            )
+        embed.add_field(
+            name="Throughput",
+            value=f"{stats['deleted_per_hour']:.2f} tickets handled per hour\n"
+            + "\n".join(
+                f"<@{actor_id}>: {handled}" for actor_id, handled in stats["handlers"]
+            ),
+            inline=False,
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(
+        name="ticket-history", description="View the past tickets of a user"
+    )
+    @app_commands.describe(user="The user whose tickets to show")
+    @app_commands.default_permissions(administrator=True)
+    async def ticket_history(
+        self, interaction: discord.Interaction, user: discord.User
+    ):
+        rows = await self.tickets.history(user.id)
+        if not rows:
+            await interaction.response.send_message(
+                f"No archived tickets found for {user.mention}", ephemeral=True
+            )
+            return
+
+        embed = discord.Embed(
+            title=f"Ticket History for {user.name}",
+            description=f"{len(rows)} most recent archived tickets",
+            color=discord.Color.blue(),
+        )
+        for row in rows:
+            opened = (
+                datetime.fromtimestamp(row["opened_at"]).strftime("%Y-%m-%d %H:%M")
+                if row["opened_at"]
+                else "Unknown"
+            )
+            closed = datetime.fromtimestamp(row["closed_at"]).strftime("%Y-%m-%d %H:%M")
+            embed.add_field(
+                name=f"#{row['id']} - {row['channel_name']}",
+                value=f"Category: {row['category']}\n"
+                f"Opened: {opened}\n"
+                f"Closed: {closed}\n"
+                f"Deleted by: <@{row['deleted_by']}>",
+                inline=False,
+            )
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
+        # Enregistrer les messages des tickets pour la transcription
+        if message.channel.id in self.tickets.channels:
+            await self.tickets.capture(message.channel.id, transcript_record(message))
+
         if message.author.bot:
             return
 
         # Check if message is in a ticket channel
-        for user_id, ticket in self.bot.config["tickets"]["active_tickets"].items():
-            if (
-                ticket["channel_id"] == message.channel.id
-                and ticket["status"] == "waiting_description"
-            ):
-                # Vérifier que c'est bien l'auteur du ticket qui écrit
-                if str(message.author.id) != user_id:
-                    return
-
-                # Update status and notify support
-                ticket["status"] = "active"
-                self.bot.save_config()
-
-                support_role = message.guild.get_role(
-                    self.bot.config["tickets"]["support_role_id"]
-                )
-                await message.channel.send(
-                    f"{support_role.mention} New ticket needs attention!"
-                )
-                break
+        found = self.tickets.find(message.channel.id)
+        if not found:
+            return
+        self.touch(message.channel.id)
+
+        user_id, ticket = found
+        if ticket["status"] != "waiting_description":
+            return
+
+        # Vérifier que c'est bien l'auteur du ticket qui écrit
+        if str(message.author.id) != user_id:
+            return
+
+        # Update status and notify support
+        await self.tickets.set_status(user_id, "active")
+
+        support_role = message.guild.get_role(
+            self.bot.config["tickets"]["support_role_id"]
+        )
+        await message.channel.send(
+            f"{support_role.mention} New ticket needs attention!"
+        )
+
+    @commands.Cog.listener()
+    async def on_message_edit(self, before: discord.Message, after: discord.Message):
+        if after.channel.id in self.tickets.channels:
+            await self.tickets.capture(after.channel.id, transcript_record(after))
 
 
 async def setup(bot):
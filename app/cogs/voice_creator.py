@@ -1,11 +1,28 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
+import asyncio
+import time
+from datetime import datetime
 from typing import Optional
+from utils.channel_pool import ChannelPool
+from utils.rate_limit import RouteLimiter
+from utils.scheduler import DeadlineScheduler
 from .ticket_system import TicketSetupView
 from .moderation import ModerationSetupView
 from .autorole import AutoroleSetupView
 
+# Créations de salons JTC traitées en parallèle lors d'une rafale d'arrivées
+JTC_WORKERS = 8
+# Créations simultanées sur la route de création de salons de la guilde
+JTC_CREATE_CONCURRENCY = 2
+# Nom des salons vocaux cachés de la réserve JTC
+JTC_POOL_CHANNEL_NAME = "🔇 JTC pool"
+# Intervalle de vérification des heures creuses de la réserve
+JTC_POOL_CHECK_INTERVAL = 600
+# Délai avant suppression d'un salon vidé (reconnexion, retour dans le lobby)
+JTC_EMPTY_GRACE = 60
+
 
 class SetupView(discord.ui.View):
     def __init__(self, bot):
@@ -148,7 +165,7 @@ class VoiceLogsView(discord.ui.View):
         self.bot.config["logs"]["voice"]["events"][
             "channel_create"
         ] = not self.bot.config["logs"]["voice"]["events"]["channel_create"]
-        self.bot.save_config()
+        self.bot.save_config("logs")
         self.update_buttons()
         await interaction.response.edit_message(view=self)
 
@@ -159,7 +176,7 @@ class VoiceLogsView(discord.ui.View):
         self.bot.config["logs"]["voice"]["events"][
             "channel_delete"
         ] = not self.bot.config["logs"]["voice"]["events"]["channel_delete"]
-        self.bot.save_config()
+        self.bot.save_config("logs")
         self.update_buttons()
         await interaction.response.edit_message(view=self)
 
@@ -170,7 +187,7 @@ class VoiceLogsView(discord.ui.View):
         self.bot.config["logs"]["voice"]["events"][
             "channel_rename"
         ] = not self.bot.config["logs"]["voice"]["events"]["channel_rename"]
-        self.bot.save_config()
+        self.bot.save_config("logs")
         self.update_buttons()
         await interaction.response.edit_message(view=self)
 
@@ -222,7 +239,7 @@ class JTCCategoryModal(discord.ui.Modal, title="Configuration de la catégorie J
                 return
 
             self.bot.config["jtc"]["category_id"] = category_id
-            self.bot.save_config()
+            self.bot.save_config("jtc")
             await interaction.response.send_message(
                 f"✅ Catégorie configurée: {category.name}", ephemeral=True
             )
@@ -266,7 +283,7 @@ class JTCChannelModal(discord.ui.Modal, title="Configuration du salon JTC"):
             self.bot.config["jtc"]["channel_id"] = channel.id
             self.bot.config["jtc"]["channel_name"] = self.channel_name.value
             self.bot.config["jtc"]["user_limit"] = user_limit
-            self.bot.save_config()
+            self.bot.save_config("jtc")
 
             await interaction.response.send_message(
                 f"✅ Salon JTC configuré!\nNom: {self.channel_name.value}\nLimite: {user_limit} utilisateurs",
@@ -314,7 +331,7 @@ class TicketLogsView(discord.ui.View):
         self.bot.config["logs"]["ticket"]["events"][
             "ticket_create"
         ] = not self.bot.config["logs"]["ticket"]["events"]["ticket_create"]
-        self.bot.save_config()
+        self.bot.save_config("logs")
         self.update_buttons()
         await interaction.response.edit_message(view=self)
 
@@ -325,7 +342,7 @@ class TicketLogsView(discord.ui.View):
         self.bot.config["logs"]["ticket"]["events"][
             "ticket_close"
         ] = not self.bot.config["logs"]["ticket"]["events"]["ticket_close"]
-        self.bot.save_config()
+        self.bot.save_config("logs")
         self.update_buttons()
         await interaction.response.edit_message(view=self)
 
@@ -336,7 +353,7 @@ class TicketLogsView(discord.ui.View):
         self.bot.config["logs"]["ticket"]["events"][
             "ticket_delete"
         ] = not self.bot.config["logs"]["ticket"]["events"]["ticket_delete"]
-        self.bot.save_config()
+        self.bot.save_config("logs")
         self.update_buttons()
         await interaction.response.edit_message(view=self)
 
@@ -366,10 +383,7 @@ class ForumSetupModal(discord.ui.Modal, title="Configuration du Forum"):
                 self.bot.config["forum"] = {}
 
             self.bot.config["forum"]["channel_id"] = forum_id
-            self.bot.config["forum"]["links"] = self.bot.config["forum"].get(
-                "links", {}
-            )
-            self.bot.save_config()
+            self.bot.save_config("forum")
 
             await interaction.response.send_message(
                 f"✅ Forum configuré: {forum.name}", ephemeral=True
@@ -381,6 +395,336 @@ class ForumSetupModal(discord.ui.Modal, title="Configuration du Forum"):
 class VoiceCreator(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # Caches mémoire des tables jtc_channels et jtc_bans
+        self.created_channels = {}  # {channel_id: owner_id}
+        self.banned_users = {}  # {channel_id: {user_id}}
+        # File des arrivées dans le salon JTC, traitée par JTC_WORKERS tâches
+        self.join_queue: asyncio.Queue = asyncio.Queue()
+        self.queued_members = set()
+        self.workers = []
+        self.limiter = RouteLimiter(JTC_CREATE_CONCURRENCY)
+        # Salons créés pas encore écrits en base (une écriture par rafale)
+        self.pending_channels = []
+        self.flush_lock = asyncio.Lock()
+        # Réserve de salons vocaux pré-créés, réduite pendant les heures creuses
+        self.pool = ChannelPool(self.create_pool_channel)
+        self.pool_task: Optional[asyncio.Task] = None
+        # Salons vides : suppression après le délai de grâce, annulée au retour
+        # d'un membre, puis faite par lots (expired_channels)
+        self.empty_channels = DeadlineScheduler(self.expire_channel)
+        self.expired_channels = []
+        self.delete_task: Optional[asyncio.Task] = None
+        # Rapprochement avec la guilde fait (reporté si elle est indisponible)
+        self.reconciled = False
+
+    async def cog_load(self):
+        self.workers = [
+            asyncio.create_task(self.join_worker()) for _ in range(JTC_WORKERS)
+        ]
+        for row in await self.bot.db.fetchall(
+            "SELECT channel_id, owner_id FROM jtc_channels"
+        ):
+            self.created_channels[str(row["channel_id"])] = row["owner_id"]
+        for row in await self.bot.db.fetchall(
+            "SELECT channel_id, user_id FROM jtc_bans"
+        ):
+            self.banned_users.setdefault(row["channel_id"], set()).add(row["user_id"])
+
+    async def cog_unload(self):
+        for worker in self.workers:
+            worker.cancel()
+        if self.pool_task is not None:
+            self.pool_task.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        await self.pool.close()
+        await self.empty_channels.close()
+        await self.flush_channels()
+
+    async def expire_channel(self, channel_id: int):
+        """Fin du délai de grâce d'un salon vide"""
+        channel = self.bot.get_channel(channel_id)
+        if channel is not None and channel.members:
+            return
+        self.expired_channels.append(channel_id)
+        # Les échéances simultanées sont regroupées dans le même lot
+        if self.delete_task is None or self.delete_task.done():
+            self.delete_task = asyncio.create_task(self.delete_expired())
+
+    async def delete_expired(self):
+        while self.expired_channels:
+            channel_ids, self.expired_channels = self.expired_channels, []
+            removed = await asyncio.gather(
+                *(self.delete_channel(channel_id) for channel_id in channel_ids)
+            )
+            await self.forget_channels(
+                [c for c, done in zip(channel_ids, removed) if done]
+            )
+
+    async def forget_channels(self, channel_ids: list):
+        """Retire des salons supprimés des caches et de la base, en un lot"""
+        for channel_id in channel_ids:
+            self.created_channels.pop(str(channel_id), None)
+            self.banned_users.pop(int(channel_id), None)
+        rows = [(channel_id,) for channel_id in channel_ids]
+        await self.bot.db.executemany(
+            "DELETE FROM jtc_channels WHERE channel_id = ?", rows
+        )
+        await self.bot.db.executemany("DELETE FROM jtc_bans WHERE channel_id = ?", rows)
+
+    async def delete_channel(self, channel_id: int) -> bool:
+        """Supprime un salon JTC ; False s'il faut le garder (erreur de l'API)"""
+        # Vérifier si le salon existe toujours
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            return True
+        try:
+            channel_name = channel.name
+            async with self.limiter.route("channel_delete", channel.guild.id):
+                await channel.delete()
+        except discord.NotFound:
+            # Si le salon n'existe plus, on le retire juste de la config
+            return True
+        except discord.HTTPException as e:
+            print(f"✗ Erreur suppression salon JTC {channel_id}: {str(e)}")
+            return False
+
+        # Log si activé
+        if self.bot.config["logs"]["voice"]["events"]["channel_delete"]:
+            self.bot.log_to_file(
+                "VOICE_DELETE",
+                f"Channel '{channel_name}' was deleted (empty)",
+                channel_id=channel_id,
+            )
+        return True
+
+    async def reconcile(self) -> bool:
+        """Rapproche jtc_channels et jtc_bans des salons de la guilde au démarrage.
+
+        Les salons vidés pendant un arrêt du bot n'ont reçu aucun événement :
+        ils sont supprimés, et les salons disparus sont retirés de la base.
+        Sans guilde disponible (panne Discord, READY partiel), tous les salons
+        paraîtraient disparus : le rapprochement attend le prochain on_ready.
+        """
+        config = self.bot.config["jtc"]
+        anchor = self.bot.get_channel(config["channel_id"]) or self.bot.get_channel(
+            config.get("category_id")
+        )
+        if anchor is None or anchor.guild.unavailable:
+            print("✗ Guilde JTC indisponible, rapprochement des salons reporté")
+            return False
+
+        missing, empty = [], []
+        for channel_id in map(int, self.created_channels):
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                missing.append(channel_id)
+            elif not channel.members:
+                empty.append(channel_id)
+
+        # Suppressions simultanées, bornées par le limiteur de la route
+        removed = await asyncio.gather(
+            *(self.delete_channel(channel_id) for channel_id in empty)
+        )
+        deleted = [c for c, done in zip(empty, removed) if done]
+        # Bannissements de salons qui ne sont plus des salons JTC
+        orphan_bans = [
+            c
+            for c in self.banned_users
+            if str(c) not in self.created_channels or c in missing
+        ]
+        await self.forget_channels(missing + deleted + orphan_bans)
+
+        # Bannissements enregistrés sans permission (avant l'interdiction par
+        # permission) : une modification par salon
+        edits = []
+        for channel_id, user_ids in self.banned_users.items():
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                continue
+            overwrites = channel.overwrites
+            denied = {t.id for t, o in overwrites.items() if o.connect is False}
+            if user_ids - denied:
+                for user_id in user_ids - denied:
+                    target = discord.Object(id=user_id, type=discord.Member)
+                    overwrites[target] = discord.PermissionOverwrite(connect=False)
+                edits.append(channel.edit(overwrites=overwrites))
+        for result in await asyncio.gather(*edits, return_exceptions=True):
+            if isinstance(result, Exception):
+                print(f"✗ Erreur permissions des bannis JTC: {str(result)}")
+
+        if missing or deleted or orphan_bans:
+            print(
+                f"✓ Salons JTC rapprochés : {len(deleted)} vides supprimés, "
+                f"{len(missing)} disparus retirés, "
+                f"{len(orphan_bans)} listes de bannis retirées"
+            )
+        return True
+
+    def pool_target(self) -> int:
+        """Taille de réserve voulue, selon l'heure locale"""
+        config = self.bot.config["jtc"]
+        quiet_hours = config.get("pool_quiet_hours")
+        if quiet_hours:
+            start, end = quiet_hours
+            hour = datetime.now().hour
+            quiet = start <= hour < end if start <= end else hour >= start or hour < end
+            if quiet:
+                return config.get("pool_quiet_size", 0)
+        return config.get("pool_size", 0)
+
+    async def pool_scheduler(self):
+        while True:
+            target = self.pool_target()
+            if target != self.pool.size:
+                print(f"Réserve JTC : {self.pool.size} → {target} salons")
+                self.pool.resize(target)
+            await asyncio.sleep(JTC_POOL_CHECK_INTERVAL)
+
+    async def create_pool_channel(self) -> Optional[discord.VoiceChannel]:
+        """Crée un salon vocal caché dans la catégorie JTC pour la réserve"""
+        # Les arrivées en attente passent avant le remplissage
+        await self.join_queue.join()
+        category = self.bot.get_channel(self.bot.config["jtc"]["category_id"])
+        if not isinstance(category, discord.CategoryChannel):
+            return None
+        async with self.limiter.route("create_channel", category.guild.id):
+            return await category.create_voice_channel(
+                name=JTC_POOL_CHANNEL_NAME,
+                overwrites={
+                    category.guild.default_role: discord.PermissionOverwrite(
+                        view_channel=False, connect=False
+                    )
+                },
+            )
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        await self.try_reconcile()
+        if self.pool_task is not None:
+            return
+        # Reprendre les salons de réserve laissés par une exécution précédente
+        category = self.bot.get_channel(self.bot.config["jtc"]["category_id"])
+        if isinstance(category, discord.CategoryChannel):
+            self.pool.adopt(
+                channel
+                for channel in category.voice_channels
+                if channel.name == JTC_POOL_CHANNEL_NAME
+                and str(channel.id) not in self.created_channels
+            )
+        self.pool_task = asyncio.create_task(self.pool_scheduler())
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild):
+        # Guilde indisponible au démarrage puis revenue
+        await self.try_reconcile()
+
+    async def try_reconcile(self):
+        """Lance le rapprochement une seule fois, dès que la guilde est disponible"""
+        if not self.reconciled:
+            self.reconciled = True
+            self.reconciled = await self.reconcile()
+
+    async def join_worker(self):
+        while True:
+            member, category, queued_at, reconnect = await self.join_queue.get()
+            try:
+                await self.create_channel_for(member, category, queued_at, reconnect)
+            except Exception as e:
+                print(f"✗ Erreur création salon JTC pour {member.name}: {str(e)}")
+            finally:
+                self.queued_members.discard(member.id)
+                self.join_queue.task_done()
+            # Fin de rafale : enregistrer d'un coup les salons créés
+            if self.join_queue.empty():
+                await self.flush_channels()
+
+    async def flush_channels(self):
+        async with self.flush_lock:
+            count = len(self.pending_channels)
+            # Un salon déjà vidé et supprimé entre-temps n'est pas enregistré
+            rows = [
+                row
+                for row in self.pending_channels[:count]
+                if str(row[0]) in self.created_channels
+            ]
+            if rows:
+                await self.bot.db.executemany(
+                    "INSERT OR REPLACE INTO jtc_channels (channel_id, owner_id) VALUES (?, ?)",
+                    rows,
+                )
+            # Retirés seulement une fois écrits : un arrêt pendant l'écriture les garde
+            del self.pending_channels[:count]
+
+    async def create_channel_for(
+        self,
+        member: discord.Member,
+        category: discord.CategoryChannel,
+        queued_at: float,
+        reconnect: bool = False,
+    ):
+        """Crée le salon d'un membre arrivé dans le salon JTC et l'y déplace.
+
+        reconnect : le membre n'était dans aucun salon vocal avant le salon JTC.
+        """
+        config = self.bot.config["jtc"]
+        # Le membre a pu quitter le salon JTC pendant l'attente
+        if not member.voice or not member.voice.channel:
+            return
+        if member.voice.channel.id != config["channel_id"]:
+            return
+
+        # Après une reconnexion, rendre au membre son salon vidé en attente de
+        # suppression ; venu d'un autre salon, il en veut un nouveau
+        if reconnect:
+            for channel_id in list(self.empty_channels.deadlines):
+                channel = self.bot.get_channel(channel_id)
+                if channel and self.created_channels.get(str(channel_id)) == member.id:
+                    self.empty_channels.cancel(channel_id)
+                    try:
+                        await member.move_to(channel)
+                    except discord.HTTPException:
+                        # Déconnecté entre-temps : le salon reste vide
+                        self.empty_channels.schedule(channel_id, time.time())
+                    return
+
+        # Prendre un salon de la réserve (renommé et rendu visible en un appel),
+        # sinon créer un nouveau salon
+        new_channel = self.pool.claim()
+        if new_channel is not None:
+            await new_channel.edit(
+                name=f"🔊 Channel of {member.display_name}",
+                user_limit=config["user_limit"],
+                sync_permissions=True,
+            )
+        else:
+            async with self.limiter.route("create_channel", category.guild.id):
+                new_channel = await category.create_voice_channel(
+                    name=f"🔊 Channel of {member.display_name}",
+                    user_limit=config["user_limit"],
+                )
+        self.created_channels[str(new_channel.id)] = member.id
+
+        # Déplacer l'utilisateur (route propre à chaque membre, non limitée ici)
+        try:
+            await member.move_to(new_channel)
+        except discord.HTTPException:
+            # Déconnecté entre-temps : le salon ne sera jamais vidé, le supprimer
+            del self.created_channels[str(new_channel.id)]
+            await new_channel.delete()
+            return
+
+        # Sauvegarder le salon créé (écriture groupée par flush_channels)
+        self.pending_channels.append((new_channel.id, member.id))
+
+        # Log si activé
+        if self.bot.config["logs"]["voice"]["events"]["channel_create"]:
+            self.bot.log_to_file(
+                "VOICE_CREATE",
+                f"Channel '{new_channel.name}' created by {member.name}#{member.discriminator} (ID: {member.id})",
+                user_id=member.id,
+                channel_id=new_channel.id,
+                wait_ms=round((time.perf_counter() - queued_at) * 1000),
+            )
 
     @app_commands.command(name="setup", description="Configure bot settings")
     @app_commands.default_permissions(administrator=True)
@@ -390,11 +734,40 @@ class VoiceCreator(commands.Cog):
             "🔧 Bot Configuration", view=view, ephemeral=True
         )
 
+    @app_commands.command(
+        name="jtc-stats", description="View Join to Create pool and queue statistics"
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def jtc_stats(self, interaction: discord.Interaction):
+        pool = self.pool.stats()
+        limiter = self.limiter.stats()
+
+        def format_ms(value: Optional[float]) -> str:
+            return f"{value:.0f} ms" if value is not None else "-"
+
+        hit_rate = f"{pool['hit_rate']:.0%}" if pool["hit_rate"] is not None else "-"
+        embed = discord.Embed(title="Join to Create", color=discord.Color.blue())
+        embed.add_field(
+            name="Channel Pool",
+            value=f"Ready: {pool['ready']}/{pool['size']}\n"
+            f"Hit rate: {hit_rate} ({pool['hits']} hits, {pool['misses']} misses)\n"
+            f"Refill: {format_ms(pool['last_refill_ms'] if pool['refills'] else None)} last, "
+            f"{format_ms(pool['avg_refill_ms'])} avg ({pool['refills']} refills)",
+            inline=False,
+        )
+        embed.add_field(
+            name="Queue",
+            value=f"Waiting: {self.join_queue.qsize()}\n"
+            f"API calls: {limiter['calls']} ({limiter['rate_limited']} rate limited)",
+            inline=False,
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     def is_channel_owner(self, member: discord.Member, channel_id: str) -> bool:
         """Vérifie si le membre est le propriétaire du salon"""
         return (
-            str(channel_id) in self.bot.config["jtc"]["created_channels"]
-            and self.bot.config["jtc"]["created_channels"][str(channel_id)] == member.id
+            str(channel_id) in self.created_channels
+            and self.created_channels[str(channel_id)] == member.id
         )
 
     @app_commands.command(
@@ -482,21 +855,28 @@ class VoiceCreator(commands.Cog):
             )
             return
 
-        # Ajouter l'utilisateur à la liste des bannis du salon
-        channel_id = str(channel.id)
-        if "banned_users" not in self.bot.config["jtc"]:
-            self.bot.config["jtc"]["banned_users"] = {}
-        if channel_id not in self.bot.config["jtc"]["banned_users"]:
-            self.bot.config["jtc"]["banned_users"][channel_id] = []
-
-        if user.id in self.bot.config["jtc"]["banned_users"][channel_id]:
+        # Ajouter l'utilisateur aux bannis du salon
+        banned = self.banned_users.setdefault(channel.id, set())
+        if user.id in banned:
             await interaction.response.send_message(
                 "❌ This user is already banned!", ephemeral=True
             )
             return
 
-        self.bot.config["jtc"]["banned_users"][channel_id].append(user.id)
-        self.bot.save_config()
+        # La permission empêche Discord de le laisser rejoindre le salon
+        try:
+            await channel.set_permissions(user, connect=False)
+        except discord.HTTPException:
+            await interaction.response.send_message(
+                "❌ I can't update this channel's permissions!", ephemeral=True
+            )
+            return
+
+        banned.add(user.id)
+        await self.bot.db.execute(
+            "INSERT OR IGNORE INTO jtc_bans (channel_id, user_id) VALUES (?, ?)",
+            (channel.id, user.id),
+        )
 
         if user in channel.members:
             await user.move_to(None)
@@ -529,6 +909,9 @@ class VoiceCreator(commands.Cog):
             self.bot.log_to_file(
                 "VOICE_RENAME",
                 f"Channel renamed from '{old_name}' to '{name}' by {interaction.user.name}#{interaction.user.discriminator} (ID: {interaction.user.id})",
+                user_id=interaction.user.id,
+                channel_id=channel.id,
+                name=name,
             )
 
         await interaction.response.send_message(
@@ -620,69 +1003,36 @@ class VoiceCreator(commands.Cog):
     ):
         config = self.bot.config["jtc"]
 
-        # Vérifier si l'utilisateur rejoint le salon JTC
+        # Vérifier si l'utilisateur rejoint le salon JTC : création en file,
+        # une seule demande en attente par membre
         if after.channel and after.channel.id == config["channel_id"]:
-            # Créer un nouveau salon
-            category = after.channel.category
-            new_channel = await category.create_voice_channel(
-                name=f"🔊 Channel of {member.display_name}",
-                user_limit=config["user_limit"],
-            )
-
-            # Déplacer l'utilisateur
-            await member.move_to(new_channel)
+            if member.id not in self.queued_members:
+                self.queued_members.add(member.id)
+                self.join_queue.put_nowait(
+                    (
+                        member,
+                        after.channel.category,
+                        time.perf_counter(),
+                        before.channel is None,
+                    )
+                )
 
-            # Sauvegarder le salon créé
-            config["created_channels"][str(new_channel.id)] = member.id
-            self.bot.save_config()
+        # Retour dans un salon vide : annuler sa suppression
+        if after.channel and after.channel.id in self.empty_channels:
+            self.empty_channels.cancel(after.channel.id)
 
-            # Log si activé
-            if self.bot.config["logs"]["voice"]["events"]["channel_create"]:
-                self.bot.log_to_file(
-                    "VOICE_CREATE",
-                    f"Channel '{new_channel.name}' created by {member.name}#{member.discriminator} (ID: {member.id})",
+        # Salon vide : suppression après le délai de grâce
+        if before.channel and str(before.channel.id) in self.created_channels:
+            if len(before.channel.members) == 0:
+                self.empty_channels.schedule(
+                    before.channel.id,
+                    time.time() + config.get("empty_grace_seconds", JTC_EMPTY_GRACE),
                 )
 
-        # Vérifier si un salon est vide pour le supprimer
-        if before.channel and str(before.channel.id) in config["created_channels"]:
-            if len(before.channel.members) == 0:
-                try:
-                    channel_name = before.channel.name
-                    channel_id = str(before.channel.id)
-
-                    # Vérifier si le salon existe toujours
-                    channel = member.guild.get_channel(before.channel.id)
-                    if channel:
-                        await channel.delete()
-
-                    # Supprimer de la configuration dans tous les cas
-                    del config["created_channels"][channel_id]
-                    self.bot.save_config()
-
-                    # Log si activé
-                    if self.bot.config["logs"]["voice"]["events"]["channel_delete"]:
-                        self.bot.log_to_file(
-                            "VOICE_DELETE",
-                            f"Channel '{channel_name}' was deleted (empty)",
-                        )
-                except discord.NotFound:
-                    # Si le salon n'existe plus, on le retire juste de la config
-                    del config["created_channels"][str(before.channel.id)]
-                    self.bot.save_config()
-
-        # Vérifier si l'utilisateur est banni du salon qu'il essaie de rejoindre
-        if after.channel and str(after.channel.id) in self.bot.config["jtc"].get(
-            "banned_users", {}
-        ):
-            if (
-                member.id
-                in self.bot.config["jtc"]["banned_users"][str(after.channel.id)]
-            ):
-                await member.move_to(None)
-                try:
-                    await member.send("You are banned from this voice channel!")
-                except discord.Forbidden:
-                    pass
+        # Les bannis sont bloqués par permission ; seul un membre qui passe
+        # outre (administrateur, déplacé par un modérateur) arrive ici
+        if after.channel and member.id in self.banned_users.get(after.channel.id, ()):
+            await member.move_to(None)
 
 
 async def setup(bot):
@@ -2,11 +2,30 @@ import discord
 from discord.ext import commands
 import json
 import os
+import signal
+import asyncio
+import time
 from dotenv import load_dotenv
 import datetime
+from typing import Optional
+from utils.config_store import ConfigStore, load_json, write_json_atomic
+from utils.database import Database
+from utils.log_storage import EventLog, SegmentedLog
+from utils.log_writer import BatchedWriter
+from utils.migrate import migrate
 
 CONFIG_PATH = "/home/app/config.json"
 LOGS_PATH = "/home/app/logs.txt"
+EVENTS_PATH = "/home/app/events.jsonl"
+STATE_DIR = "/home/app/data"
+DB_PATH = "/home/app/data/bot.db"
+
+# Données d'exécution sorties de config.json : chaque cog possède son fichier
+RUNTIME_STATE = {
+    "jtc": ["created_channels", "banned_users"],
+    "tickets": ["active_tickets", "closed_tickets"],
+    "forum": ["links"],
+}
 
 # Chargement des variables d'environnement
 load_dotenv()
@@ -27,10 +46,25 @@ class CustomBot(commands.Bot):
             help_command=None,  # Désactive la commande help par défaut
         )
 
+        self.states = {}
+        self.log_writers = {}
         self.config = self.load_config()
+        self.config_store = ConfigStore(CONFIG_PATH, self.config)
+        self.db = Database(DB_PATH)
 
     async def setup_hook(self):
         print("Début de la configuration...")
+        # Docker arrête le conteneur via SIGTERM : fermer proprement pour vider les écritures
+        try:
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGTERM, lambda: asyncio.create_task(self.close())
+            )
+        except NotImplementedError:
+            pass
+
+        # Base SQLite des données d'exécution (import unique des anciens JSON)
+        await asyncio.to_thread(migrate, DB_PATH)
+        await self.db.connect()
         # Charger les cogs
         print()
         for cog in os.listdir("/home/app/cogs"):
@@ -73,7 +107,10 @@ class CustomBot(commands.Bot):
                 "channel_id": None,
                 "channel_name": "➕ Create Channel",
                 "user_limit": 0,
-                "created_channels": {},
+                "pool_size": 0,  # Salons vocaux pré-créés (0 : désactivé)
+                "pool_quiet_hours": [2, 10],  # Heures creuses (heure locale)
+                "pool_quiet_size": 0,  # Taille de la réserve en heures creuses
+                "empty_grace_seconds": 60,  # Délai avant suppression d'un salon vide
             },
             "tickets": {
                 "message_channel_id": None,
@@ -81,8 +118,10 @@ class CustomBot(commands.Bot):
                 "category_id": None,
                 "transcript_channel_id": None,
                 "categories": {"Technical": "🔧", "Moderation": "🛡️", "Other": "❓"},
-                "active_tickets": {},
-                "closed_tickets": {},
+                "archive_retention_days": 365,  # None pour tout conserver
+                "channel_pool_size": 0,  # Salons pré-créés (0 : désactivé)
+                "idle_close_hours": 0,  # Fermeture des tickets inactifs (0 : désactivé)
+                "idle_warning_hours": 12,  # Avertissement avant la fermeture
             },
             "moderation": {
                 "enabled": True,
@@ -107,6 +146,8 @@ class CustomBot(commands.Bot):
                 "message_id": None,
                 "roles": {},  # {role_id: emoji}
             },
+            # Flux d'événements structurés (JSON Lines) pour les outils d'analyse
+            "event_log": {"enabled": False},
         }
 
         try:
@@ -163,6 +204,11 @@ class CustomBot(commands.Bot):
                     if "autorole" not in config:
                         config["autorole"] = default_config["autorole"]
 
+                    if "event_log" not in config:
+                        config["event_log"] = default_config["event_log"]
+
+                    self.migrate_state(config)
+
                     with open(CONFIG_PATH, "w") as f2:
                         json.dump(config, f2, indent=4)
                     return config
@@ -175,17 +221,74 @@ class CustomBot(commands.Bot):
                 json.dump(default_config, f, indent=4)
             return default_config
 
-    def log_to_file(self, event_type: str, message: str):
+    def migrate_state(self, config: dict):
+        """Déplace les données d'exécution de config.json vers leurs fichiers dédiés"""
+        os.makedirs(STATE_DIR, exist_ok=True)
+        for section, keys in RUNTIME_STATE.items():
+            moved = {
+                key: config[section].pop(key)
+                for key in keys
+                if key in config.get(section, {})
+            }
+            if not moved:
+                continue
+
+            path = os.path.join(STATE_DIR, f"{section}.json")
+            # Un fichier existant fait foi : la migration ne s'applique qu'une fois
+            if not os.path.exists(path):
+                write_json_atomic(path, moved)
+                print(f"✓ Données '{section}' migrées vers {path}")
+
+    def get_state(self, name: str, default: Optional[dict] = None) -> ConfigStore:
+        """Retourne le stockage des données d'exécution d'une section"""
+        if name not in self.states:
+            os.makedirs(STATE_DIR, exist_ok=True)
+            path = os.path.join(STATE_DIR, f"{name}.json")
+            data = load_json(path, {})
+            for key, value in (default or {}).items():
+                data.setdefault(key, value)
+            self.states[name] = ConfigStore(path, data)
+        return self.states[name]
+
+    def get_log(self, path: str, storage_class=SegmentedLog) -> BatchedWriter:
+        """Retourne l'écriture en arrière-plan d'un fichier de logs segmenté"""
+        if path not in self.log_writers:
+            self.log_writers[path] = BatchedWriter(storage_class(path))
+        return self.log_writers[path]
+
+    def log_event(self, event_type: str, **fields):
+        """Ajoute un événement typé au flux structuré, s'il est activé.
+
+        Les champs (IDs entiers, textes bruts) sont sérialisés en JSON par le
+        thread d'écriture, pas sur la boucle d'événements.
+        """
+        if not self.config["event_log"]["enabled"]:
+            return
+        self.get_log(EVENTS_PATH, EventLog).write(
+            {"ts": int(time.time()), "type": event_type, **fields}
+        )
+
+    def log_to_file(self, event_type: str, message: str, **fields):
         """Write a log message to the logs file"""
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         log_entry = f"[{timestamp}] [{event_type}] {message}\n"
 
-        with open(LOGS_PATH, "a", encoding="utf-8") as f:
-            f.write(log_entry)
+        self.get_log(LOGS_PATH).write(log_entry)
+        self.log_event(event_type, message=message, **fields)
+
+    def save_config(self, section: Optional[str] = None):
+        """Marque la configuration comme modifiée (écriture différée)"""
+        self.config_store.mark_dirty(section)
 
-    def save_config(self):
-        with open(CONFIG_PATH, "w") as f:
-            json.dump(self.config, f, indent=4)
+    async def close(self):
+        await self.config_store.close()
+        for state in self.states.values():
+            await state.close()
+        await super().close()
+        # Les cogs sont déchargés : vider les files d'écriture des logs
+        for writer in self.log_writers.values():
+            await writer.close()
+        await self.db.close()
 
 
 bot = CustomBot()
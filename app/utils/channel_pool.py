@@ -0,0 +1,113 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+# Pause avant de réessayer après un échec de création (permissions, limite de salons)
+RETRY_DELAY = 60
+
+
+class ChannelPool:
+    """Réserve de salons pré-créés, cachés, prêts à être attribués.
+
+    claim() retourne immédiatement un salon de la réserve (ou None si elle
+    est vide) : l'appelant n'a plus qu'à le renommer et poser ses permissions
+    en un seul appel à l'API. La réserve est complétée en arrière-plan, un
+    salon à la fois, par la coroutine create fournie par le cog ; réduire
+    sa taille supprime les salons en trop.
+    """
+
+    def __init__(self, create: Callable[[], Awaitable], size: int = 0):
+        self.create = create
+        self.size = size
+        self.channels = deque()
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.refill_time = 0.0
+        self.last_refill_time = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._shrink_task: Optional[asyncio.Task] = None
+
+    def adopt(self, channels):
+        """Reprend les salons de la réserve laissés par une exécution précédente"""
+        self.channels.extend(channels)
+
+    def resize(self, size: int):
+        self.size = size
+        excess = []
+        while len(self.channels) > size:
+            excess.append(self.channels.pop())
+        if excess:
+            self._shrink_task = asyncio.create_task(self._delete(excess))
+        self.refill()
+
+    async def _delete(self, channels: list):
+        for channel in channels:
+            try:
+                await channel.delete()
+            except Exception as e:
+                print(f"✗ Erreur suppression salon de réserve: {str(e)}")
+
+    def claim(self):
+        """Retire un salon de la réserve, ou None s'il faut en créer un"""
+        while self.channels:
+            channel = self.channels.popleft()
+            # Un salon supprimé à la main n'est plus dans le cache de la guilde
+            if channel.guild.get_channel(channel.id) is not None:
+                self.hits += 1
+                self.refill()
+                return channel
+        if self.size:
+            self.misses += 1
+        self.refill()
+        return None
+
+    def refill(self):
+        if len(self.channels) < self.size and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._fill())
+
+    async def _fill(self):
+        while len(self.channels) < self.size:
+            start = time.perf_counter()
+            try:
+                channel = await self.create()
+            except Exception as e:
+                print(f"✗ Erreur création salon de réserve: {str(e)}")
+                await asyncio.sleep(RETRY_DELAY)
+                continue
+            if channel is None:
+                return
+            self.last_refill_time = time.perf_counter() - start
+            self.refill_time += self.last_refill_time
+            self.refills += 1
+            # La taille a pu être réduite pendant la création
+            if len(self.channels) >= self.size:
+                await self._delete([channel])
+                return
+            self.channels.append(channel)
+
+    def stats(self) -> dict:
+        claims = self.hits + self.misses
+        return {
+            "size": self.size,
+            "ready": len(self.channels),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / claims if claims else None,
+            "refills": self.refills,
+            "last_refill_ms": self.last_refill_time * 1000,
+            "avg_refill_ms": (
+                self.refill_time / self.refills * 1000 if self.refills else None
+            ),
+        }
+
+    async def close(self):
+        for task in (self._task, self._shrink_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._shrink_task = None
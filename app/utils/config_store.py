@@ -0,0 +1,115 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+
+def write_json_atomic(path: str, data, indent: Optional[int] = 4):
+    """Écrit un document JSON via un fichier temporaire puis un renommage atomique"""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def load_json(path: str, default):
+    """Charge un document JSON, ou retourne la valeur par défaut"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+class ConfigStore:
+    """Persistance différée (write-behind) d'un document JSON.
+
+    Les modifications marquent des sections comme sales ; les écritures sont
+    regroupées sur une courte fenêtre puis effectuées dans un thread.
+    """
+
+    def __init__(self, path: str, data: dict, delay: float = 1.0):
+        self.path = path
+        self.data = data
+        self.delay = delay
+        self.dirty = set()
+        self.flush_count = 0
+        self.last_flush_duration = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def mark_dirty(self, section: Optional[str] = None):
+        """Marque une section comme modifiée et programme une écriture"""
+        self.dirty.add(section or "*")
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Pas de boucle d'événements (démarrage) : écriture immédiate
+            self.flush_sync()
+            return
+
+        if self._timer is None:
+            self._timer = loop.call_later(self.delay, self._start_flush)
+
+    def _start_flush(self):
+        self._timer = None
+        self._task = asyncio.create_task(self.flush())
+
+    def _snapshot(self) -> str:
+        # Le dump compact utilise l'encodeur C : seul ce coût reste sur la boucle
+        return json.dumps(self.data)
+
+    def _write(self, snapshot: str):
+        write_json_atomic(self.path, json.loads(snapshot))
+
+    async def flush(self):
+        """Écrit les modifications en attente hors de la boucle d'événements"""
+        async with self._lock:
+            if not self.dirty:
+                return
+
+            sections = set(self.dirty)
+            self.dirty.clear()
+            snapshot = self._snapshot()
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._write, snapshot)
+            except Exception as e:
+                # On garde les sections sales pour la prochaine tentative
+                self.dirty |= sections
+                print(f"✗ Erreur sauvegarde {self.path}: {str(e)}")
+                return
+
+            self.flush_count += 1
+            self.last_flush_duration = time.perf_counter() - start
+
+    def flush_sync(self):
+        """Écrit immédiatement les modifications en attente (hors boucle)"""
+        if not self.dirty:
+            return
+        self.dirty.clear()
+        self._write(self._snapshot())
+        self.flush_count += 1
+
+    async def close(self):
+        """Annule l'écriture programmée et vide les modifications en attente"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._task is not None:
+            await self._task
+        await self.flush()
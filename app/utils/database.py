@@ -0,0 +1,161 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    channel_id INTEGER PRIMARY KEY,
+    owner_id INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    status TEXT NOT NULL,
+    closed INTEGER NOT NULL DEFAULT 0,
+    opened_at REAL,
+    closed_at REAL,
+    fully_captured INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tickets_owner ON tickets (owner_id);
+
+CREATE TABLE IF NOT EXISTS ticket_archive (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel_id INTEGER NOT NULL,
+    channel_name TEXT NOT NULL,
+    owner_id INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    opened_at REAL,
+    closed_at REAL NOT NULL,
+    deleted_by INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ticket_archive_owner ON ticket_archive (owner_id);
+CREATE INDEX IF NOT EXISTS idx_ticket_archive_category ON ticket_archive (category);
+CREATE INDEX IF NOT EXISTS idx_ticket_archive_closed ON ticket_archive (closed_at);
+
+CREATE TABLE IF NOT EXISTS ticket_messages (
+    channel_id INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (channel_id, message_id)
+);
+
+CREATE TABLE IF NOT EXISTS infraction_users (
+    user_id INTEGER PRIMARY KEY,
+    current_infractions INTEGER NOT NULL DEFAULT 0,
+    total_infractions INTEGER NOT NULL DEFAULT 0,
+    current_timeouts INTEGER NOT NULL DEFAULT 0,
+    total_timeouts INTEGER NOT NULL DEFAULT 0,
+    current_kicks INTEGER NOT NULL DEFAULT 0,
+    total_kicks INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS infraction_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    date TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_infraction_history_user
+    ON infraction_history (user_id);
+
+CREATE TABLE IF NOT EXISTS reminders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_reminders_user ON reminders (user_id, completed);
+
+CREATE TABLE IF NOT EXISTS jtc_channels (
+    channel_id INTEGER PRIMARY KEY,
+    owner_id INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS jtc_bans (
+    channel_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    PRIMARY KEY (channel_id, user_id)
+);
+"""
+
+
+# Colonnes ajoutées après la création des tables : ajoutées aux bases existantes
+ADDED_COLUMNS = {
+    "tickets": {
+        "opened_at": "REAL",
+        "closed_at": "REAL",
+        "fully_captured": "INTEGER NOT NULL DEFAULT 0",
+    }
+}
+
+
+def add_missing_columns(conn: sqlite3.Connection):
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for name, column_type in columns.items():
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Ouvre la base en mode WAL et crée le schéma si nécessaire"""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    add_missing_columns(conn)
+    conn.commit()
+    return conn
+
+
+class Database:
+    """Accès asynchrone à SQLite : toutes les requêtes passent par un thread dédié"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def connect(self):
+        self._conn = await self._run(connect, self.path)
+
+    def _execute(self, sql: str, params) -> int:
+        cursor = self._conn.execute(sql, params)
+        self._conn.commit()
+        return cursor.lastrowid
+
+    def _executemany(self, sql: str, seq_params):
+        self._conn.executemany(sql, seq_params)
+        self._conn.commit()
+
+    def _fetchone(self, sql: str, params):
+        row = self._conn.execute(sql, params).fetchone()
+        return dict(row) if row else None
+
+    def _fetchall(self, sql: str, params):
+        return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    async def execute(self, sql: str, params=()) -> int:
+        """Exécute une requête d'écriture et retourne le dernier ID inséré"""
+        return await self._run(self._execute, sql, params)
+
+    async def executemany(self, sql: str, seq_params):
+        await self._run(self._executemany, sql, list(seq_params))
+
+    async def fetchone(self, sql: str, params=()) -> Optional[dict]:
+        return await self._run(self._fetchone, sql, params)
+
+    async def fetchall(self, sql: str, params=()) -> list:
+        return await self._run(self._fetchall, sql, params)
+
+    async def close(self):
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,289 @@
+import glob
+import gzip
+import io
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional
+from utils.config_store import load_json, write_json_atomic
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_DIR = "/home/app/archives"
+SEGMENT_MAX_BYTES = 32 * 1024 * 1024
+SEGMENT_MAX_AGE = 7 * 24 * 3600
+RETENTION_DAYS = 365
+CHUNK_SIZE = 1024 * 1024
+TAIL_BLOCK_SIZE = 64 * 1024
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def line_timestamp(line: str) -> Optional[float]:
+    """Lit l'horodatage "[YYYY-mm-dd HH:MM:SS]" en début de ligne"""
+    try:
+        return datetime.strptime(line[1:20], TIMESTAMP_FORMAT).timestamp()
+    except ValueError:
+        return None
+
+
+def event_timestamp(line: str) -> Optional[float]:
+    """Lit le champ "ts" d'une ligne JSON"""
+    try:
+        return float(json.loads(line)["ts"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def first_timestamp(path: str, parse=line_timestamp) -> Optional[float]:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return parse(f.readline())
+    except FileNotFoundError:
+        return None
+
+
+def count_lines(path: str) -> int:
+    try:
+        with open(path, "rb") as f:
+            return sum(
+                chunk.count(b"\n") for chunk in iter(lambda: f.read(CHUNK_SIZE), b"")
+            )
+    except FileNotFoundError:
+        return 0
+
+
+def tail_lines(path: str, count: int, block_size: int = TAIL_BLOCK_SIZE) -> list:
+    """Lit les count dernières lignes en remontant par blocs depuis la fin du fichier"""
+    if count <= 0:
+        return []
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        blocks, newlines = [], 0
+        # count + 1 retours à la ligne garantissent count lignes complètes
+        while position > 0 and newlines <= count:
+            size = min(block_size, position)
+            position -= size
+            f.seek(position)
+            block = f.read(size)
+            blocks.append(block)
+            newlines += block.count(b"\n")
+
+    lines = b"".join(reversed(blocks)).splitlines(keepends=True)
+    return [line.decode("utf-8", errors="replace") for line in lines[-count:]]
+
+
+class SegmentedLog:
+    """Fichier de logs segmenté, avec rotation, compression et rétention.
+
+    Le segment chaud reste au chemin d'origine et ne reçoit que des ajouts.
+    Quand il dépasse max_bytes ou max_age secondes, il est déplacé dans le
+    dossier d'archive, compressé (zstd si le module zstandard est installé,
+    gzip sinon) et référencé dans manifest.json avec sa plage de dates : les
+    lecteurs trouvent les segments d'une période sans les ouvrir. Les
+    segments plus vieux que retention_days sont supprimés.
+    """
+
+    parse_timestamp = staticmethod(line_timestamp)
+
+    def __init__(
+        self,
+        path: str,
+        archive_dir: Optional[str] = None,
+        max_bytes: int = SEGMENT_MAX_BYTES,
+        max_age: float = SEGMENT_MAX_AGE,
+        retention_days: Optional[int] = RETENTION_DAYS,
+        compression: Optional[str] = None,
+    ):
+        self.path = path
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.archive_dir = archive_dir or os.path.join(ARCHIVE_DIR, self.name)
+        self.manifest_path = os.path.join(self.archive_dir, "manifest.json")
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.retention_days = retention_days
+
+        compression = compression or ("zstd" if zstandard else "gzip")
+        if compression == "zstd" and zstandard is None:
+            print("✗ Module zstandard absent, compression gzip utilisée")
+            compression = "gzip"
+        self.compression = compression
+
+        self.lock = threading.Lock()
+        self.manifest = load_json(self.manifest_path, {"segments": []})
+        self.hot_started = first_timestamp(path, self.parse_timestamp)
+        # Compteur de lignes du segment chaud, initialisé au premier line_count()
+        self.hot_lines: Optional[int] = None
+
+    def append(self, lines: list):
+        """Ajoute des lignes au segment chaud puis le scelle si nécessaire"""
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+                size = f.tell()
+            if self.hot_started is None:
+                self.hot_started = time.time()
+            if self.hot_lines is not None:
+                self.hot_lines += sum(line.count("\n") for line in lines)
+            sealed = self._rotation_due(size) and self._seal()
+
+        if sealed:
+            self.archive_pending()
+
+    def _rotation_due(self, size: int) -> bool:
+        if size >= self.max_bytes:
+            return True
+        return time.time() - self.hot_started >= self.max_age
+
+    def _seal(self) -> bool:
+        """Déplace le segment chaud dans le dossier d'archive"""
+        if not os.path.exists(self.path):
+            return False
+        os.makedirs(self.archive_dir, exist_ok=True)
+        stamp = datetime.fromtimestamp(self.hot_started).strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(self.archive_dir, f"{self.name}-{stamp}")
+        index = 0
+        # Plusieurs segments peuvent commencer dans la même seconde
+        while glob.glob(f"{base}-{index}.txt*"):
+            index += 1
+        os.replace(self.path, f"{base}-{index}.txt")
+        self.hot_started = None
+        self.hot_lines = 0
+        return True
+
+    def rotate(self):
+        """Force le scellement du segment chaud"""
+        with self.lock:
+            sealed = self._seal()
+        if sealed:
+            self.archive_pending()
+
+    def archive_pending(self):
+        """Compresse les segments scellés (y compris ceux laissés par un arrêt brutal)"""
+        for raw in sorted(glob.glob(os.path.join(self.archive_dir, "*.txt"))):
+            try:
+                entry = self._compress(raw)
+            except Exception as e:
+                print(f"✗ Erreur compression {raw}: {str(e)}")
+                continue
+            with self.lock:
+                self.manifest["segments"].append(entry)
+                self.manifest["segments"].sort(key=lambda s: s["start"])
+                write_json_atomic(self.manifest_path, self.manifest)
+            os.remove(raw)
+        self.apply_retention()
+
+    def _compress(self, raw: str) -> dict:
+        start = first_timestamp(raw, self.parse_timestamp) or os.path.getmtime(raw)
+        end = os.path.getmtime(raw)
+        extension = ".zst" if self.compression == "zstd" else ".gz"
+        target = raw + extension
+        tmp_path = target + ".tmp"
+
+        lines = 0
+        with open(raw, "rb") as src, open(tmp_path, "wb") as dst:
+            if self.compression == "zstd":
+                out = zstandard.ZstdCompressor(level=10).stream_writer(dst)
+            else:
+                out = gzip.GzipFile(fileobj=dst, mode="wb", compresslevel=6)
+            with out:
+                while chunk := src.read(CHUNK_SIZE):
+                    lines += chunk.count(b"\n")
+                    out.write(chunk)
+        os.replace(tmp_path, target)
+
+        return {
+            "file": os.path.basename(target),
+            "start": start,
+            "end": end,
+            "lines": lines,
+            "bytes": os.path.getsize(raw),
+            "compressed_bytes": os.path.getsize(target),
+            "compression": self.compression,
+        }
+
+    def apply_retention(self):
+        """Supprime les segments plus vieux que la durée de rétention"""
+        if not self.retention_days:
+            return
+        limit = time.time() - self.retention_days * 86400
+        with self.lock:
+            expired = [s for s in self.manifest["segments"] if s["end"] < limit]
+            if not expired:
+                return
+            self.manifest["segments"] = [
+                s for s in self.manifest["segments"] if s["end"] >= limit
+            ]
+            write_json_atomic(self.manifest_path, self.manifest)
+
+        for segment in expired:
+            try:
+                os.remove(os.path.join(self.archive_dir, segment["file"]))
+            except FileNotFoundError:
+                pass
+
+    def segments(
+        self, since: Optional[float] = None, until: Optional[float] = None
+    ) -> list:
+        """Segments scellés dont la plage de dates croise [since, until]"""
+        with self.lock:
+            segments = list(self.manifest["segments"])
+        return [
+            s
+            for s in segments
+            if (since is None or s["end"] >= since)
+            and (until is None or s["start"] <= until)
+        ]
+
+    def line_count(self) -> int:
+        """Nombre total de lignes, sans relire les segments scellés"""
+        with self.lock:
+            if self.hot_lines is None:
+                self.hot_lines = count_lines(self.path)
+            return self.hot_lines + sum(s["lines"] for s in self.manifest["segments"])
+
+    def tail(self, count: int) -> list:
+        """Retourne les count dernières lignes, segments scellés compris"""
+        try:
+            lines = tail_lines(self.path, count)
+        except FileNotFoundError:
+            lines = []
+
+        for segment in reversed(self.segments()):
+            if len(lines) >= count:
+                break
+            with self.open_segment(segment) as f:
+                lines = list(deque(f, maxlen=count - len(lines))) + lines
+        return lines
+
+    def open_segment(self, segment: dict) -> io.TextIOBase:
+        """Ouvre un segment scellé en lecture texte"""
+        path = os.path.join(self.archive_dir, segment["file"])
+        if segment["compression"] == "zstd":
+            if zstandard is None:
+                raise RuntimeError("Module zstandard requis pour lire ce segment")
+            reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+            return io.TextIOWrapper(reader, encoding="utf-8", errors="replace")
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+
+
+class EventLog(SegmentedLog):
+    """Flux d'événements au format JSON Lines, segmenté comme les logs texte.
+
+    append reçoit des dictionnaires et les sérialise dans le thread d'écriture.
+    """
+
+    parse_timestamp = staticmethod(event_timestamp)
+
+    def append(self, events: list):
+        super().append(
+            [
+                json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n"
+                for event in events
+            ]
+        )
@@ -0,0 +1,95 @@
+import asyncio
+import time
+from typing import Optional
+
+
+class BatchedWriter:
+    """Écriture de lignes de log en arrière-plan, regroupées par lots.
+
+    Les lignes sont mises en file sans bloquer la boucle d'événements ; une
+    tâche les regroupe et les écrit dans un thread dès que le lot atteint
+    max_batch lignes ou que max_delay secondes se sont écoulées. Le stockage
+    (SegmentedLog, MessageIndex : tout objet avec append(list)) est ainsi
+    toujours manipulé hors de la boucle.
+    """
+
+    def __init__(self, storage, max_batch: int = 500, max_delay: float = 1.0):
+        self.storage = storage
+        self.path = storage.path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.flush_count = 0
+        self.lines_written = 0
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self.queue.qsize()
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue_depth,
+            "flushes": self.flush_count,
+            "lines_written": self.lines_written,
+            "last_flush_ms": self.last_flush_latency * 1000,
+            "max_flush_ms": self.max_flush_latency * 1000,
+        }
+
+    def write(self, line: str):
+        """Ajoute une ligne à la file d'écriture"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        self.queue.put_nowait(line)
+        if self.queue.qsize() >= self.max_batch:
+            self._full.set()
+
+    async def _flush(self, lines: list):
+        start = time.perf_counter()
+        try:
+            await asyncio.to_thread(self.storage.append, lines)
+        except Exception as e:
+            print(f"✗ Erreur écriture {self.path}: {str(e)}")
+            return
+        latency = time.perf_counter() - start
+        self.flush_count += 1
+        self.lines_written += len(lines)
+        self.last_flush_latency = latency
+        self.max_flush_latency = max(self.max_flush_latency, latency)
+
+    async def _run(self):
+        while True:
+            batch = [await self.queue.get()]
+            if batch[0] is not None and self.queue.qsize() < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            self._full.clear()
+
+            while not self.queue.empty() and len(batch) < self.max_batch:
+                batch.append(self.queue.get_nowait())
+
+            # None est le signal de fermeture envoyé par close()
+            closing = None in batch
+            if closing:
+                while not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+
+            lines = [line for line in batch if line is not None]
+            if lines:
+                await self._flush(lines)
+            if closing:
+                return
+
+    async def close(self):
+        """Écrit les lignes en attente puis arrête la tâche d'écriture"""
+        if self._task is None:
+            return
+        self.queue.put_nowait(None)
+        self._full.set()
+        await self._task
+        self._task = None
@@ -0,0 +1,116 @@
+import sqlite3
+from typing import Optional
+from utils.log_storage import RETENTION_DAYS
+from utils.sqlite_store import SQLiteStore
+
+MESSAGE_INDEX_PATH = "/home/app/data/messages.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    message_id INTEGER NOT NULL,
+    guild_id INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    channel_name TEXT NOT NULL,
+    author_id INTEGER NOT NULL,
+    author_name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_author ON messages (author_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_messages_channel ON messages (channel_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_messages_created ON messages (created_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5 (
+    content, content='messages', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+END;
+"""
+
+COLUMNS = (
+    "message_id",
+    "guild_id",
+    "channel_id",
+    "channel_name",
+    "author_id",
+    "author_name",
+    "kind",
+    "created_at",
+    "content",
+)
+# Le tokenizer trigram ne trouve pas les recherches de moins de 3 caractères
+MIN_MATCH_LENGTH = 3
+
+
+class MessageIndex(SQLiteStore):
+    """Index SQLite FTS5 de l'archive des messages.
+
+    Alimenté par lots par le même BatchedWriter que messages.txt (append est
+    appelé dans un thread) ; les recherches par auteur, salon, période et
+    sous-chaîne passent par les index au lieu de parcourir l'archive.
+    """
+
+    SCHEMA = SCHEMA
+    TABLE = "messages"
+    TIME_COLUMN = "created_at"
+    ROW_FACTORY = sqlite3.Row
+
+    def __init__(
+        self,
+        path: str = MESSAGE_INDEX_PATH,
+        retention_days: Optional[int] = RETENTION_DAYS,
+    ):
+        super().__init__(path, retention_days)
+
+    def append(self, rows: list):
+        """Insère un lot de messages (tuples dans l'ordre de COLUMNS)"""
+        self.insert(COLUMNS, rows)
+
+    def search(
+        self,
+        author_id: Optional[int] = None,
+        channel_id: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        text: Optional[str] = None,
+        limit: int = 500,
+    ) -> list:
+        """Retourne les messages correspondants, du plus récent au plus ancien"""
+        conditions, params = [], []
+        if author_id is not None:
+            conditions.append("m.author_id = ?")
+            params.append(author_id)
+        if channel_id is not None:
+            conditions.append("m.channel_id = ?")
+            params.append(channel_id)
+        if since is not None:
+            conditions.append("m.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("m.created_at <= ?")
+            params.append(until)
+        if text and len(text) >= MIN_MATCH_LENGTH:
+            conditions.append(
+                "m.id IN (SELECT rowid FROM messages_fts WHERE messages_fts MATCH ?)"
+            )
+            params.append('"' + text.replace('"', '""') + '"')
+        elif text:
+            conditions.append("m.content LIKE ? ESCAPE '\\'")
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT m.* FROM messages m {where} "
+                "ORDER BY m.created_at DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
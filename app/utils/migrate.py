@@ -0,0 +1,140 @@
+"""Migration des anciens fichiers JSON vers la base SQLite.
+
+Usage (depuis le dossier app) : python -m utils.migrate [chemin_base]
+"""
+
+import json
+import os
+import sys
+
+from utils.database import connect
+
+DB_PATH = "/home/app/data/bot.db"
+TICKETS_PATH = "/home/app/data/tickets.json"
+JTC_PATH = "/home/app/data/jtc.json"
+INFRACTIONS_PATH = "/home/app/infractions.json"
+REMINDERS_PATH = "/home/app/reminders.json"
+
+INFRACTION_COUNTERS = (
+    "current_infractions",
+    "total_infractions",
+    "current_timeouts",
+    "total_timeouts",
+    "current_kicks",
+    "total_kicks",
+)
+
+
+def migrate_tickets(conn, data: dict) -> int:
+    rows = []
+    for closed, key in ((0, "active_tickets"), (1, "closed_tickets")):
+        for user_id, ticket in data.get(key, {}).items():
+            rows.append(
+                (
+                    ticket["channel_id"],
+                    int(user_id),
+                    ticket.get("category", "Unknown"),
+                    ticket.get("status", "active"),
+                    closed,
+                )
+            )
+    conn.executemany(
+        "INSERT OR REPLACE INTO tickets (channel_id, owner_id, category, status, closed) "
+        "VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    return len(rows)
+
+
+def migrate_jtc(conn, data: dict) -> int:
+    channels = [
+        (int(channel_id), owner_id)
+        for channel_id, owner_id in data.get("created_channels", {}).items()
+    ]
+    bans = [
+        (int(channel_id), user_id)
+        for channel_id, users in data.get("banned_users", {}).items()
+        for user_id in users
+    ]
+    conn.executemany(
+        "INSERT OR REPLACE INTO jtc_channels (channel_id, owner_id) VALUES (?, ?)",
+        channels,
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO jtc_bans (channel_id, user_id) VALUES (?, ?)", bans
+    )
+    return len(channels) + len(bans)
+
+
+def migrate_infractions(conn, data: dict) -> int:
+    count = 0
+    for user_id, user_data in data.items():
+        conn.execute(
+            f"INSERT OR REPLACE INTO infraction_users (user_id, {', '.join(INFRACTION_COUNTERS)}) "
+            f"VALUES (?, {', '.join('?' for _ in INFRACTION_COUNTERS)})",
+            (int(user_id), *(user_data.get(c, 0) for c in INFRACTION_COUNTERS)),
+        )
+        conn.executemany(
+            "INSERT INTO infraction_history (user_id, type, date, data) VALUES (?, ?, ?, ?)",
+            [
+                (int(user_id), entry["type"], entry["date"], json.dumps(entry))
+                for entry in user_data.get("history", [])
+            ],
+        )
+        count += 1
+    return count
+
+
+def migrate_reminders(conn, data: dict) -> int:
+    rows = [
+        (
+            int(user_id),
+            reminder["message"],
+            reminder["created_at"],
+            reminder["end_time"],
+            int(reminder["completed"]),
+        )
+        for user_id, user_reminders in data.items()
+        for reminder in user_reminders.values()
+    ]
+    conn.executemany(
+        "INSERT INTO reminders (user_id, message, created_at, end_time, completed) "
+        "VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    return len(rows)
+
+
+def migrate(db_path: str = DB_PATH) -> dict:
+    """Importe les fichiers JSON existants puis les renomme en *.migrated"""
+    sources = {
+        "tickets": (TICKETS_PATH, migrate_tickets),
+        "jtc": (JTC_PATH, migrate_jtc),
+        "infractions": (INFRACTIONS_PATH, migrate_infractions),
+        "reminders": (REMINDERS_PATH, migrate_reminders),
+    }
+    counts = {}
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = connect(db_path)
+    try:
+        for name, (path, migrate_source) in sources.items():
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except json.JSONDecodeError:
+                print(f"✗ Fichier {path} illisible, ignoré")
+                continue
+
+            with conn:
+                counts[name] = migrate_source(conn, data)
+            os.replace(path, f"{path}.migrated")
+            print(f"✓ {counts[name]} enregistrement(s) '{name}' migré(s) vers SQLite")
+    finally:
+        conn.close()
+    return counts
+
+
+if __name__ == "__main__":
+    migrate(*sys.argv[1:2])
@@ -0,0 +1,51 @@
+import asyncio
+import contextlib
+import time
+
+# Pause appliquée après un 429 qui n'indique pas de délai
+DEFAULT_RETRY_AFTER = 1.0
+
+
+class RouteLimiter:
+    """Concurrence bornée par route de l'API, avec pause après une limite atteinte.
+
+    discord.py attend déjà la fin d'une limite avant de réessayer ; borner
+    les appels simultanés sur une même route (création de salons d'une
+    guilde, par exemple) évite qu'une rafale remplisse le bucket et fasse
+    attendre les appels des autres routes derrière elle. Une erreur 429
+    remontée à l'appelant bloque la route pendant retry_after secondes.
+    """
+
+    def __init__(self, concurrency: int = 2):
+        self.concurrency = concurrency
+        self.semaphores = {}  # {route: asyncio.Semaphore}
+        self.blocked_until = {}  # {route: time.monotonic()}
+        self.calls = 0
+        self.rate_limited = 0
+
+    @contextlib.asynccontextmanager
+    async def route(self, *key):
+        semaphore = self.semaphores.get(key)
+        if semaphore is None:
+            semaphore = self.semaphores[key] = asyncio.Semaphore(self.concurrency)
+
+        async with semaphore:
+            delay = self.blocked_until.get(key, 0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.calls += 1
+            try:
+                yield
+            except Exception as e:
+                if getattr(e, "status", None) == 429 or hasattr(e, "retry_after"):
+                    self.rate_limited += 1
+                    retry_after = getattr(e, "retry_after", None) or DEFAULT_RETRY_AFTER
+                    self.blocked_until[key] = time.monotonic() + retry_after
+                raise
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "rate_limited": self.rate_limited,
+            "routes": len(self.semaphores),
+        }
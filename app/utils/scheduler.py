@@ -0,0 +1,76 @@
+import asyncio
+import heapq
+import time
+from typing import Awaitable, Callable, Hashable, Optional
+
+
+class DeadlineScheduler:
+    """Échéances par clé, gérées par un tas et une seule tâche.
+
+    schedule() remplace l'échéance d'une clé ; les anciennes entrées restent
+    dans le tas et sont ignorées à leur sortie (le tas est reconstruit s'il
+    en accumule trop). À échéance, callback(key) est attendu, une clé à la
+    fois : des milliers de clés ne coûtent qu'un seul minuteur.
+    """
+
+    def __init__(self, callback: Callable[[Hashable], Awaitable]):
+        self.callback = callback
+        self.deadlines = {}  # {key: timestamp}
+        self.heap = []  # [(timestamp, key)]
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __contains__(self, key) -> bool:
+        return key in self.deadlines
+
+    def __len__(self) -> int:
+        return len(self.deadlines)
+
+    def schedule(self, key, when: float):
+        self.deadlines[key] = when
+        heapq.heappush(self.heap, (when, key))
+        if len(self.heap) > 2 * len(self.deadlines) + 64:
+            self.heap = [(when, key) for key, when in self.deadlines.items()]
+            heapq.heapify(self.heap)
+        # Réveiller la tâche seulement si cette échéance passe en tête
+        if self.heap[0] == (when, key):
+            self._wakeup.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def cancel(self, key):
+        self.deadlines.pop(key, None)
+
+    async def _run(self):
+        while True:
+            # Écarter les entrées remplacées ou annulées
+            while self.heap and self.deadlines.get(self.heap[0][1]) != self.heap[0][0]:
+                heapq.heappop(self.heap)
+
+            timeout = max(0, self.heap[0][0] - time.time()) if self.heap else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+                continue
+            except asyncio.TimeoutError:
+                pass
+
+            now = time.time()
+            while self.heap and self.heap[0][0] <= now:
+                when, key = heapq.heappop(self.heap)
+                if self.deadlines.get(key) != when:
+                    continue
+                del self.deadlines[key]
+                try:
+                    await self.callback(key)
+                except Exception as e:
+                    print(f"✗ Erreur échéance {key}: {str(e)}")
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
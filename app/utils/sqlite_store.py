@@ -0,0 +1,65 @@
+import sqlite3
+import threading
+import time
+from typing import Optional
+from utils.log_storage import RETENTION_DAYS
+
+# Intervalle minimal entre deux purges des lignes expirées
+PRUNE_INTERVAL = 3600
+
+
+class SQLiteStore:
+    """Base SQLite dédiée, alimentée par lots depuis un thread (BatchedWriter).
+
+    Les sous-classes définissent SCHEMA, TABLE et TIME_COLUMN (horodatage
+    utilisé pour la rétention). La connexion (WAL) est ouverte au premier
+    accès ; insert() ajoute un lot puis purge les lignes plus anciennes que
+    retention_days, au plus une fois par PRUNE_INTERVAL.
+    """
+
+    SCHEMA = ""
+    TABLE = ""
+    TIME_COLUMN = ""
+    ROW_FACTORY = None
+
+    def __init__(self, path: str, retention_days: Optional[int] = RETENTION_DAYS):
+        self.path = path
+        self.retention_days = retention_days
+        self.lock = threading.Lock()
+        self.last_prune = 0.0
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            if self.ROW_FACTORY is not None:
+                self._conn.row_factory = self.ROW_FACTORY
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    def insert(self, columns: tuple, rows: list):
+        """Insère un lot de lignes (tuples dans l'ordre de columns)"""
+        with self.lock:
+            with self.conn:
+                self.conn.executemany(
+                    f"INSERT INTO {self.TABLE} ({', '.join(columns)}) "
+                    f"VALUES ({', '.join('?' for _ in columns)})",
+                    rows,
+                )
+            if self.retention_days and time.time() - self.last_prune > PRUNE_INTERVAL:
+                self.last_prune = time.time()
+                with self.conn:
+                    self.conn.execute(
+                        f"DELETE FROM {self.TABLE} WHERE {self.TIME_COLUMN} < ?",
+                        (time.time() - self.retention_days * 86400,),
+                    )
+
+    def close(self):
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
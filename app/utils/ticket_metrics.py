@@ -0,0 +1,160 @@
+import time
+from typing import Optional
+from utils.log_storage import RETENTION_DAYS
+from utils.sqlite_store import SQLiteStore
+
+TICKET_METRICS_PATH = "/home/app/data/metrics.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ticket_transitions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel_id INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    at REAL NOT NULL,
+    actor_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_ticket_transitions_at ON ticket_transitions (at);
+CREATE INDEX IF NOT EXISTS idx_ticket_transitions_channel
+    ON ticket_transitions (channel_id, state);
+"""
+
+COLUMNS = ("channel_id", "state", "at", "actor_id")
+
+# Transitions enregistrées par TicketStore
+STATES = ("created", "active", "closed", "reopened", "deleted")
+
+# Durées mesurées : (nom, état de départ, état d'arrivée, description)
+DURATIONS = (
+    ("wait", "created", "active", "Waiting for description"),
+    ("active", "active", "closed", "Active until closed"),
+    ("close_to_delete", "closed", "deleted", "Closed until deleted"),
+    ("resolution", "created", "deleted", "Total lifetime"),
+)
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def percentile(values: list, quantile: float) -> float:
+    """Percentile au rang le plus proche d'une liste triée"""
+    index = max(0, min(len(values) - 1, round(quantile * len(values)) - 1))
+    return values[index]
+
+
+def summarize(values: list) -> dict:
+    values = sorted(values)
+    summary = {"count": len(values), "sum": sum(values)}
+    for quantile in QUANTILES:
+        summary[quantile] = percentile(values, quantile) if values else None
+    return summary
+
+
+class TicketMetrics(SQLiteStore):
+    """Série temporelle des transitions d'état des tickets (base SQLite dédiée).
+
+    Chaque transition est une ligne ajoutée par lots via un BatchedWriter
+    (append est appelé dans un thread) : l'enregistrement coûte O(1) sur la
+    boucle d'événements. Les durées et percentiles sont calculés à la demande
+    par stats(), pour /ticket-stats et l'export Prometheus.
+    """
+
+    SCHEMA = SCHEMA
+    TABLE = "ticket_transitions"
+    TIME_COLUMN = "at"
+
+    def __init__(
+        self,
+        path: str = TICKET_METRICS_PATH,
+        retention_days: Optional[int] = RETENTION_DAYS,
+    ):
+        super().__init__(path, retention_days)
+
+    def append(self, rows: list):
+        """Insère un lot de transitions (tuples dans l'ordre de COLUMNS)"""
+        self.insert(COLUMNS, rows)
+
+    def stats(self, since: float) -> dict:
+        """Durées entre transitions, volumes et débit de traitement depuis since"""
+        with self.lock:
+            # Première occurrence de chaque état par ticket (la dernière pour
+            # closed : un ticket rouvert puis refermé compte sa dernière fermeture)
+            tickets = self.conn.execute(
+                "SELECT channel_id, "
+                "MIN(CASE WHEN state = 'created' THEN at END), "
+                "MIN(CASE WHEN state = 'active' THEN at END), "
+                "MAX(CASE WHEN state = 'closed' THEN at END), "
+                "MIN(CASE WHEN state = 'deleted' THEN at END) "
+                "FROM ticket_transitions WHERE channel_id IN "
+                "(SELECT channel_id FROM ticket_transitions WHERE at >= ?) "
+                "GROUP BY channel_id",
+                (since,),
+            ).fetchall()
+            counts = dict(
+                self.conn.execute(
+                    "SELECT state, COUNT(*) FROM ticket_transitions "
+                    "WHERE at >= ? GROUP BY state",
+                    (since,),
+                ).fetchall()
+            )
+            handlers = self.conn.execute(
+                "SELECT actor_id, COUNT(*) AS handled FROM ticket_transitions "
+                "WHERE at >= ? AND state = 'deleted' AND actor_id IS NOT NULL "
+                "GROUP BY actor_id ORDER BY handled DESC LIMIT 5",
+                (since,),
+            ).fetchall()
+
+        durations = {name: [] for name, *_ in DURATIONS}
+        for _, *times in tickets:
+            at = dict(zip(("created", "active", "closed", "deleted"), times))
+            for name, start, end, _ in DURATIONS:
+                if at[start] is not None and at[end] is not None and at[end] >= since:
+                    durations[name].append(at[end] - at[start])
+
+        hours = max((time.time() - since) / 3600, 1)
+        return {
+            "durations": {
+                name: summarize(values) for name, values in durations.items()
+            },
+            "counts": {state: counts.get(state, 0) for state in STATES},
+            "deleted_per_hour": counts.get("deleted", 0) / hours,
+            "handlers": handlers,
+        }
+
+
+def render_prometheus(
+    stats: dict, open_tickets: dict, pool: Optional[dict] = None
+) -> str:
+    """Format texte Prometheus : durées en summary, tickets ouverts en gauge"""
+    lines = []
+    for name, _, _, description in DURATIONS:
+        metric = f"nebula_ticket_{name}_seconds"
+        summary = stats["durations"][name]
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} summary")
+        for quantile in QUANTILES:
+            if summary[quantile] is not None:
+                lines.append(
+                    f'{metric}{{quantile="{quantile}"}} {summary[quantile]:.3f}'
+                )
+        lines.append(f"{metric}_sum {summary['sum']:.3f}")
+        lines.append(f"{metric}_count {summary['count']}")
+
+    lines.append("# HELP nebula_ticket_transitions Ticket state transitions in window")
+    lines.append("# TYPE nebula_ticket_transitions gauge")
+    for state, count in stats["counts"].items():
+        lines.append(f'nebula_ticket_transitions{{state="{state}"}} {count}')
+
+    lines.append("# HELP nebula_tickets_open Tickets currently open, by status")
+    lines.append("# TYPE nebula_tickets_open gauge")
+    for status, count in open_tickets.items():
+        lines.append(f'nebula_tickets_open{{status="{status}"}} {count}')
+
+    if pool:
+        lines.append("# HELP nebula_ticket_pool_ready Pre-created ticket channels")
+        lines.append("# TYPE nebula_ticket_pool_ready gauge")
+        lines.append(f"nebula_ticket_pool_ready {pool['ready']}")
+        lines.append("# HELP nebula_ticket_pool_claims_total Ticket channel claims")
+        lines.append("# TYPE nebula_ticket_pool_claims_total counter")
+        lines.append(f'nebula_ticket_pool_claims_total{{result="hit"}} {pool["hits"]}')
+        lines.append(
+            f'nebula_ticket_pool_claims_total{{result="miss"}} {pool["misses"]}'
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,155 @@
+import gzip
+import html
+import json
+import tempfile
+from string import Template
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<style>
+body { background: #313338; color: #dbdee1; font-family: sans-serif; margin: 0 2em; }
+h1 { font-size: 1.3em; border-bottom: 1px solid #4e5058; padding: 1em 0; }
+.message { display: flex; gap: 1em; padding: 0.4em 0; }
+.avatar { width: 40px; height: 40px; border-radius: 50%; }
+.author { font-weight: bold; color: #f2f3f5; }
+.time { color: #949ba4; font-size: 0.8em; margin-left: 0.5em; }
+.content { white-space: pre-wrap; word-wrap: break-word; }
+.embed { border-left: 4px solid #5865f2; background: #2b2d31; padding: 0.5em 1em; margin-top: 0.3em; }
+.embed-title { font-weight: bold; }
+.field-name { font-weight: bold; margin-top: 0.4em; }
+.attachment img { max-width: 400px; max-height: 300px; margin-top: 0.3em; }
+</style>
+</head>
+<body>
+<h1>$title</h1>
+"""
+
+MESSAGE_TEMPLATE = """<div class="message" id="m$id">
+<img class="avatar" src="$avatar" alt="">
+<div><span class="author">$author</span><span class="time">$timestamp</span>
+<div class="content">$content</div>$extras</div>
+</div>
+"""
+
+EMBED_TEMPLATE = """<div class="embed"><div class="embed-title">$title</div>\
+<div class="content">$description</div>$fields</div>"""
+
+FIELD_TEMPLATE = (
+    """<div class="field-name">$name</div><div class="content">$value</div>"""
+)
+
+IMAGE_TEMPLATE = """<div class="attachment"><a href="$url"><img src="$url" alt="$filename"></a></div>"""
+
+FILE_TEMPLATE = """<div class="attachment"><a href="$url">$filename</a> ($size)</div>"""
+
+# Manifeste JSON des avatars et pièces jointes, référencés par URL
+FOOTER_TEMPLATE = """<script type="application/json" id="manifest">$manifest</script>
+</body>
+</html>
+"""
+
+
+def format_size(size: int) -> str:
+    for unit in ("o", "Ko", "Mo"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} Go"
+
+
+class TranscriptRenderer:
+    """Modèles HTML des transcriptions, compilés une seule fois au chargement du cog"""
+
+    def __init__(self, spool_size: int):
+        self.spool_size = spool_size
+        self.page = Template(PAGE_TEMPLATE)
+        self.message = Template(MESSAGE_TEMPLATE)
+        self.embed = Template(EMBED_TEMPLATE)
+        self.field = Template(FIELD_TEMPLATE)
+        self.image = Template(IMAGE_TEMPLATE)
+        self.file = Template(FILE_TEMPLATE)
+        self.footer = Template(FOOTER_TEMPLATE)
+
+    def open(self, title: str) -> "HtmlTranscript":
+        return HtmlTranscript(self, title)
+
+
+class HtmlTranscript:
+    """Transcription HTML compressée en gzip, écrite par lots de messages.
+
+    Les méthodes write et finish font le rendu et la compression : elles sont
+    appelées dans un thread par l'appelant.
+    """
+
+    def __init__(self, renderer: TranscriptRenderer, title: str):
+        self.renderer = renderer
+        self.file = tempfile.SpooledTemporaryFile(max_size=renderer.spool_size)
+        self.output = gzip.GzipFile(fileobj=self.file, mode="wb")
+        self.authors = {}  # {author_id: {"name": ..., "avatar": ...}}
+        self.attachments = []
+        self.output.write(
+            renderer.page.substitute(title=html.escape(title)).encode("utf-8")
+        )
+
+    def render_embed(self, embed: dict) -> str:
+        fields = "".join(
+            self.renderer.field.substitute(
+                name=html.escape(name), value=html.escape(value)
+            )
+            for name, value in embed["fields"]
+        )
+        return self.renderer.embed.substitute(
+            title=html.escape(embed["title"] or ""),
+            description=html.escape(embed["description"] or ""),
+            fields=fields,
+        )
+
+    def render_attachment(self, attachment: dict) -> str:
+        self.attachments.append(attachment)
+        template = (
+            self.renderer.image
+            if (attachment["content_type"] or "").startswith("image/")
+            else self.renderer.file
+        )
+        return template.substitute(
+            url=html.escape(attachment["url"]),
+            filename=html.escape(attachment["filename"]),
+            size=format_size(attachment["size"]),
+        )
+
+    def write(self, records: list):
+        """Ajoute un lot de messages (dictionnaires simples, voir ticket_system)"""
+        chunks = []
+        for record in records:
+            self.authors.setdefault(
+                record["author_id"],
+                {"name": record["author"], "avatar": record["avatar"]},
+            )
+            extras = "".join(map(self.render_embed, record["embeds"]))
+            extras += "".join(map(self.render_attachment, record["attachments"]))
+            chunks.append(
+                self.renderer.message.substitute(
+                    id=record["id"],
+                    avatar=html.escape(record["avatar"]),
+                    author=html.escape(record["author"]),
+                    timestamp=record["timestamp"],
+                    content=html.escape(record["content"]),
+                    extras=extras,
+                )
+            )
+        self.output.write("".join(chunks).encode("utf-8"))
+
+    def finish(self):
+        """Termine le document et retourne le fichier gzip, rembobiné"""
+        manifest = json.dumps(
+            {"authors": self.authors, "attachments": self.attachments}
+        ).replace("</", "<\\/")
+        self.output.write(
+            self.renderer.footer.substitute(manifest=manifest).encode("utf-8")
+        )
+        self.output.close()
+        self.file.seek(0)
+        return self.file
@@ -0,0 +1,214 @@
+import re
+import unicodedata
+from typing import Optional
+
+WORD_PATTERN = re.compile(r"\b\w+\b")
+# Lettres isolées séparées par de la ponctuation ou des espaces : "p.u.t.a.i.n"
+SPACED_PATTERN = re.compile(r"(?<!\w)(?:\w[\W_]{1,3}){2,}\w(?!\w)")
+SEPARATOR_PATTERN = re.compile(r"[\W_]+")
+# Mot mêlant lettres et chiffres : "p4ss", "a55" (pas "455" ni "4.5.5")
+MIXED_PATTERN = re.compile(r"\w*(?:\d[^\W\d_]|[^\W\d_]\d)\w*")
+RUN_PATTERN = re.compile(r"(\w)\1+")
+
+ZERO_WIDTH = "\u00ad\u200b\u200c\u200d\u200e\u200f\u2060\ufeff"
+
+# Chiffres du leetspeak, remplacés seulement dans les mots qui contiennent
+# aussi des lettres : les nombres, scores et versions restent intacts
+DIGIT_TABLE = str.maketrans("01345789", "oieastbg")
+
+# Symboles du leetspeak, lettres cyrilliques et grecques ressemblantes
+CONFUSABLES = {
+    "@": "a",
+    "$": "s",
+    "€": "e",
+    "а": "a",
+    "в": "b",
+    "е": "e",
+    "к": "k",
+    "м": "m",
+    "н": "h",
+    "о": "o",
+    "р": "p",
+    "с": "c",
+    "т": "t",
+    "у": "y",
+    "х": "x",
+    "і": "i",
+    "ј": "j",
+    "ѕ": "s",
+    "α": "a",
+    "β": "b",
+    "ε": "e",
+    "ι": "i",
+    "κ": "k",
+    "ν": "v",
+    "ο": "o",
+    "ρ": "p",
+    "τ": "t",
+    "υ": "u",
+    "χ": "x",
+}
+
+
+class FoldTable(dict):
+    """Table de translation remplie à la demande : chaque caractère n'est
+    normalisé (minuscules, NFKD sans accents, confusables) qu'une seule fois"""
+
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        if char in ZERO_WIDTH:
+            folded = ""
+        else:
+            folded = "".join(
+                c
+                for c in unicodedata.normalize("NFKD", char.lower())
+                if not unicodedata.combining(c)
+            )
+            folded = "".join(CONFUSABLES.get(c, c) for c in folded)
+        self[codepoint] = folded
+        return folded
+
+
+FOLD_TABLE = FoldTable()
+
+
+def _join_spaced(match: re.Match) -> str:
+    joined = SEPARATOR_PATTERN.sub("", match.group())
+    # "4 5 5" ou "4-5-5" est un nombre, pas un mot espacé
+    return match.group() if joined.isdigit() else joined
+
+
+def _fold_digits(match: re.Match) -> str:
+    return match.group().translate(DIGIT_TABLE)
+
+
+def normalize(text: str) -> str:
+    """Normalise un message pour contrer les contournements du filtre.
+
+    Les séparateurs (ponctuation, espaces multiples, retours à la ligne,
+    "_") deviennent une seule espace : "fils-de-pute" et "fils  de\npute"
+    ont la même forme que l'expression "fils de pute".
+    """
+    text = text.translate(FOLD_TABLE)
+    text = SPACED_PATTERN.sub(_join_spaced, text)
+    text = MIXED_PATTERN.sub(_fold_digits, text)
+    return SEPARATOR_PATTERN.sub(" ", text)
+
+
+def collapse_runs(text: str) -> str:
+    """Réduit les lettres répétées : "fuuuck" devient "fuck"""
+    return RUN_PATTERN.sub(r"\1", text)
+
+
+def trie_pattern(words) -> str:
+    """Construit une alternance factorisée par préfixes (trie) des mots donnés"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        end = "" in node
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not end:
+            return branches[0]
+        pattern = "(?:" + "|".join(branches) + ")"
+        return pattern + "?" if end else pattern
+
+    return build(trie)
+
+
+class PhraseMatcher:
+    """Recherche d'expressions de plusieurs mots via un trie compilé en regex"""
+
+    def __init__(self, phrases: dict):
+        self.phrases = phrases  # {forme normalisée: mot interdit d'origine}
+        self.pattern = re.compile(f"(?=({trie_pattern(phrases)}))") if phrases else None
+
+    def find_all(self, text: str) -> set:
+        if self.pattern is None:
+            return set()
+        matches = set()
+        for phrase in self.pattern.findall(text):
+            # Le trie retourne la plus longue expression : ajouter ses préfixes
+            matches.update(
+                self.phrases[phrase[:end]]
+                for end in range(1, len(phrase) + 1)
+                if phrase[:end] in self.phrases
+            )
+        return matches
+
+
+class BannedWordMatcher:
+    """Recherche compilée des mots interdits.
+
+    Le message est normalisé une fois (voir normalize), puis les mots simples
+    sont cherchés dans un ensemble et les expressions de plusieurs mots via
+    une seule expression régulière compilée en trie. Les lettres répétées
+    ne sont réduites que pour les mots qui en contiennent, pour éviter les
+    faux positifs ("as" ne correspond pas à "ass", mais "asss" oui).
+    """
+
+    def __init__(self, banned_words: list):
+        # Ordre de la liste : on retourne le premier mot interdit trouvé
+        self.order = {word: index for index, word in enumerate(banned_words)}
+        words, collapsed_words, phrases = {}, {}, {}
+        # Expressions réduites, indexées par leur premier mot
+        self.collapsed_phrases = {}
+        for word in banned_words:
+            key = normalize(word)
+            if " " in key:
+                phrases.setdefault(key, word)
+                parts = tuple(WORD_PATTERN.findall(collapse_runs(key)))
+                if parts:
+                    self.collapsed_phrases.setdefault(parts[0], []).append(
+                        (parts, word)
+                    )
+            else:
+                words.setdefault(key, word)
+                collapsed_words.setdefault(collapse_runs(key), word)
+
+        self.words = words
+        self.collapsed_words = collapsed_words
+        self.phrases = PhraseMatcher(phrases)
+
+    def find_collapsed_phrases(self, tokens: list) -> set:
+        matches = set()
+        for index, token in enumerate(tokens):
+            for parts, word in self.collapsed_phrases.get(token, ()):
+                if tuple(tokens[index : index + len(parts)]) == parts:
+                    matches.add(word)
+        return matches
+
+    def find(self, content: str) -> Optional[str]:
+        """Retourne le premier mot interdit contenu dans le message"""
+        text = normalize(content)
+        tokens = WORD_PATTERN.findall(text)
+        matches = {self.words[token] for token in self.words.keys() & tokens}
+        matches |= self.phrases.find_all(text)
+
+        collapsed = collapse_runs(text)
+        if collapsed != text:
+            # La réduction ne change pas le découpage : les mots restent alignés
+            short_tokens = WORD_PATTERN.findall(collapsed)
+            changed = {
+                short for token, short in zip(tokens, short_tokens) if short != token
+            }
+            matches.update(
+                self.collapsed_words[short]
+                for short in changed & self.collapsed_words.keys()
+            )
+            if changed and not self.collapsed_phrases.keys().isdisjoint(short_tokens):
+                matches |= self.find_collapsed_phrases(short_tokens)
+
+        if not matches:
+            return None
+        return min(matches, key=self.order.__getitem__)
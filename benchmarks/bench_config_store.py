@@ -0,0 +1,93 @@
+"""Mesure le blocage de la boucle d'événements lors des sauvegardes de config.
+
+Compare l'ancien save_config (json.dump indent=4 synchrone) au ConfigStore
+différé, avec une config contenant un historique de tickets volumineux.
+
+Usage : python benchmarks/bench_config_store.py [nb_tickets] [nb_sauvegardes]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from utils.config_store import ConfigStore  # noqa: E402
+
+
+def build_config(tickets: int) -> dict:
+    return {
+        "logs": {"voice": {"enabled": False, "events": {}}},
+        "jtc": {
+            "created_channels": {str(10**17 + i): 10**17 + i for i in range(200)}
+        },
+        "tickets": {
+            "active_tickets": {},
+            "closed_tickets": {
+                str(10**17 + i): {
+                    "channel_id": 10**17 + i,
+                    "category": "Technical",
+                    "status": "active",
+                }
+                for i in range(tickets)
+            },
+        },
+    }
+
+
+async def measure(save, saves: int, interval: float) -> dict:
+    """Lance un battement de cœur et mesure son retard pendant les sauvegardes"""
+    lags = []
+    running = True
+
+    async def heartbeat():
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    task = asyncio.create_task(heartbeat())
+    for _ in range(saves):
+        save()
+        await asyncio.sleep(interval)
+    running = False
+    await task
+
+    lags.sort()
+    return {
+        "max_ms": lags[-1] * 1000,
+        "p99_ms": lags[int(len(lags) * 0.99)] * 1000,
+        "total_ms": sum(lags) * 1000,
+    }
+
+
+async def main(tickets: int, saves: int):
+    config = build_config(tickets)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "config.json")
+
+        def legacy_save():
+            with open(path, "w") as f:
+                json.dump(config, f, indent=4)
+
+        before = await measure(legacy_save, saves, 0.01)
+
+        store = ConfigStore(path, config, delay=0.5)
+        after = await measure(lambda: store.mark_dirty("jtc"), saves, 0.01)
+        await store.close()
+
+    print(f"{tickets} tickets fermés, {saves} sauvegardes (une toutes les 10 ms)")
+    for name, result in (("save_config", before), ("ConfigStore", after)):
+        print(
+            f"{name:>12}: blocage max {result['max_ms']:.2f} ms, "
+            f"p99 {result['p99_ms']:.2f} ms, cumulé {result['total_ms']:.1f} ms"
+        )
+    print(f"ConfigStore: {store.flush_count} écriture(s) effective(s)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    asyncio.run(main(*(args + [5000, 100][len(args) :])))
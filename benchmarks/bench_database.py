@@ -0,0 +1,97 @@
+"""Compare la latence par opération : document JSON complet vs SQLite.
+
+Pour 10k et 100k enregistrements, mesure une mise à jour d'un utilisateur
+(réécriture complète du JSON vs upsert d'une ligne) et une recherche par ID.
+
+Usage : python benchmarks/bench_database.py [tailles...]
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from utils.database import Database  # noqa: E402
+
+COUNTERS = (
+    "current_infractions",
+    "total_infractions",
+    "current_timeouts",
+    "total_timeouts",
+    "current_kicks",
+    "total_kicks",
+)
+
+
+def bench_json(path: str, size: int, ops: int) -> dict:
+    data = {
+        str(10**17 + i): {**{c: 0 for c in COUNTERS}, "history": []}
+        for i in range(size)
+    }
+    keys = list(data)
+
+    start = time.perf_counter()
+    for _ in range(ops):
+        data[random.choice(keys)]["total_infractions"] += 1
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+    update = (time.perf_counter() - start) / ops
+
+    start = time.perf_counter()
+    for _ in range(ops * 100):
+        data.get(random.choice(keys))
+    lookup = (time.perf_counter() - start) / (ops * 100)
+    return {"update": update, "lookup": lookup}
+
+
+async def bench_sqlite(path: str, size: int, ops: int) -> dict:
+    db = Database(path)
+    await db.connect()
+    await db.executemany(
+        "INSERT INTO infraction_users (user_id) VALUES (?)",
+        ((10**17 + i,) for i in range(size)),
+    )
+    ids = [10**17 + random.randrange(size) for _ in range(ops)]
+
+    start = time.perf_counter()
+    for user_id in ids:
+        await db.execute(
+            "UPDATE infraction_users SET total_infractions = total_infractions + 1 "
+            "WHERE user_id = ?",
+            (user_id,),
+        )
+    update = (time.perf_counter() - start) / ops
+
+    start = time.perf_counter()
+    for user_id in ids:
+        await db.fetchone(
+            "SELECT * FROM infraction_users WHERE user_id = ?", (user_id,)
+        )
+    lookup = (time.perf_counter() - start) / ops
+    await db.close()
+    return {"update": update, "lookup": lookup}
+
+
+async def main(sizes):
+    print(f"{'taille':>8} {'moteur':>8} {'mise à jour':>14} {'recherche':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            json_result = bench_json(
+                os.path.join(tmp, "infractions.json"), size, max(3, 50000 // size)
+            )
+            sqlite_result = await bench_sqlite(os.path.join(tmp, "bot.db"), size, 1000)
+
+        for name, result in (("json", json_result), ("sqlite", sqlite_result)):
+            print(
+                f"{size:>8} {name:>8} {result['update'] * 1000:>11.3f} ms "
+                f"{result['lookup'] * 1e6:>9.2f} µs"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(a) for a in sys.argv[1:]] or [10_000, 100_000]))
@@ -0,0 +1,103 @@
+"""Compare les minuteurs d'inactivité : une tâche par ticket vs DeadlineScheduler.
+
+Programme une échéance pour N tickets, simule des messages (chaque message
+repousse l'échéance de son ticket), puis attend que toutes les échéances
+expirent. Mesure le coût d'un message, le retard des rappels et la mémoire.
+
+Usage : python benchmarks/bench_idle_scheduler.py [nb_tickets] [nb_messages]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from utils.scheduler import DeadlineScheduler  # noqa: E402
+
+DELAY = 1.0
+
+
+async def per_task(count: int, touches: list):
+    """Ancienne approche : une tâche par ticket, annulée à chaque message"""
+    fired, late = [], []
+    tasks, deadlines = {}, {}
+
+    async def timer(key, when):
+        await asyncio.sleep(when - time.time())
+        fired.append(key)
+        late.append(time.time() - when)
+
+    def touch(key):
+        if key in tasks:
+            tasks[key].cancel()
+        deadlines[key] = time.time() + DELAY
+        tasks[key] = asyncio.create_task(timer(key, deadlines[key]))
+
+    return touch, fired, late, lambda: asyncio.gather(*tasks.values())
+
+
+async def heap(count: int, touches: list):
+    """DeadlineScheduler : activité notée en O(1), échéance repoussée à expiration"""
+    fired, late = [], []
+    last_activity = {}
+    scheduler = None
+
+    async def check(key):
+        when = last_activity[key] + DELAY
+        if time.time() < when:
+            scheduler.schedule(key, when)
+            return
+        fired.append(key)
+        late.append(time.time() - when)
+
+    scheduler = DeadlineScheduler(check)
+
+    def touch(key):
+        last_activity[key] = time.time()
+        if key not in scheduler:
+            scheduler.schedule(key, last_activity[key] + DELAY)
+
+    async def wait():
+        while len(fired) < count:
+            await asyncio.sleep(0.05)
+        await scheduler.close()
+
+    return touch, fired, late, wait
+
+
+async def run(name: str, factory, count: int, touches: list):
+    tracemalloc.start()
+    touch, fired, late, wait = await factory(count, touches)
+    for key in range(count):
+        touch(key)
+    start = time.perf_counter()
+    for key in touches:
+        touch(key)
+    per_touch = (time.perf_counter() - start) / len(touches)
+    memory = tracemalloc.get_traced_memory()[1] / 1024**2
+    await wait()
+    tracemalloc.stop()
+
+    assert sorted(fired) == list(range(count))
+    late.sort()
+    print(
+        f"{name:>16}: {per_touch * 1e6:6.2f} µs/message, retard médian "
+        f"{late[len(late) // 2] * 1000:6.1f} ms, max {late[-1] * 1000:6.1f} ms, "
+        f"pic mémoire {memory:6.1f} Mo"
+    )
+
+
+async def main(count: int, messages: int):
+    rng = random.Random(42)
+    touches = [rng.randrange(count) for _ in range(messages)]
+    await run("tâche par ticket", per_task, count, touches)
+    await run("DeadlineScheduler", heap, count, touches)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    asyncio.run(main(*(args + [10000, 200000][len(args) :])))
@@ -0,0 +1,360 @@
+"""Rejoue une rafale d'arrivées dans le salon Join-to-Create sur une guilde simulée.
+
+Les événements (fichier JSON Lines enregistré, ou rafale synthétique de fin
+de match : 40 joueurs en 2 secondes, quelques doubles arrivées et départs
+du lobby) sont envoyés à VoiceCreator.on_voice_state_update comme le fait
+discord.py : une tâche par événement. La création de salons partage un
+bucket de limite de l'API ; les déplacements ont chacun leur route. Mesure
+la latence arrivée → déplacement (p50/p99) et les salons créés pour rien,
+avec la file de VoiceCreator ou avec l'ancien traitement (--legacy). Avec
+--pool=N, la réserve de VoiceCreator contient N salons au début de la rafale.
+
+--reconnects=N ajoute des déconnexions après la rafale : N joueurs quittent
+leur salon puis reviennent (dans leur salon, ou par le lobby) 0,5 à 3 s plus
+tard. Les salons vidés sont supprimés après --grace=S secondes (0 : ancienne
+suppression immédiate) ; le total des appels à l'API est affiché.
+
+Format d'un enregistrement : {"t": 0.12, "member": 1, "before": null, "after": 10}
+(secondes depuis le début, IDs de salons ; 10 est le salon JTC, "previous" le
+dernier salon du joueur hors lobby).
+
+Usage : python benchmarks/bench_jtc_burst.py [fichier.jsonl] [--legacy] [--pool=N]
+        [--reconnects=N] [--grace=S] [--bucket=N/S] [--latency=MS]
+"""
+
+import asyncio
+import functools
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import types
+
+import discord
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from cogs.voice_creator import VoiceCreator  # noqa: E402
+from utils.database import Database  # noqa: E402
+
+JTC_CHANNEL_ID = 10
+ids = itertools.count(10**17)
+
+
+class FakeBucket:
+    """Bucket de limite : discord.py attend la réinitialisation quand il est vide"""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset_at = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            now = time.perf_counter()
+            if now >= self.reset_at:
+                self.remaining, self.reset_at = self.limit, now + self.window
+            if self.remaining == 0:
+                await asyncio.sleep(self.reset_at - now)
+                self.remaining, self.reset_at = (
+                    self.limit,
+                    time.perf_counter() + self.window,
+                )
+            self.remaining -= 1
+
+
+class FakeGuild:
+    def __init__(self, latency: float, bucket: FakeBucket, rng: random.Random):
+        self.id = 1
+        self.latency = latency
+        self.bucket = bucket
+        self.rng = rng
+        self.channels = {}
+        self.created = 0
+        self.deleted = 0
+        self.calls = 0
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    async def api_call(self):
+        self.calls += 1
+        await asyncio.sleep(self.latency * self.rng.uniform(0.5, 1.5))
+
+
+class FakeVoiceChannel:
+    def __init__(self, guild: FakeGuild, name: str, category=None, channel_id=None):
+        self.id = channel_id or next(ids)
+        self.guild = guild
+        self.name = name
+        self.category = category
+        self.members = []
+        guild.channels[self.id] = self
+
+    async def edit(self, name: str, **kwargs):
+        await self.guild.api_call()
+        self.name = name
+
+    async def delete(self):
+        await self.guild.api_call()
+        self.guild.channels.pop(self.id, None)
+        self.guild.deleted += 1
+
+
+class FakeCategory:
+    def __init__(self, guild: FakeGuild):
+        self.id = next(ids)
+        self.guild = guild
+
+    async def create_voice_channel(self, name: str, **kwargs):
+        await self.guild.bucket.acquire()
+        await self.guild.api_call()
+        self.guild.created += 1
+        return FakeVoiceChannel(self.guild, name, self)
+
+
+class FakeMember:
+    def __init__(self, member_id: int, guild: FakeGuild):
+        self.id = member_id
+        self.guild = guild
+        self.name = self.display_name = f"joueur{member_id}"
+        self.discriminator = "0000"
+        self.voice = None
+        self.own_channel = None
+        self.joined_at = None
+        self.moved_at = None
+
+    def set_channel(self, channel):
+        if self.voice and self.member_of(self.voice.channel):
+            self.voice.channel.members.remove(self)
+        self.voice = types.SimpleNamespace(channel=channel) if channel else None
+        if channel:
+            channel.members.append(self)
+            if channel.id != JTC_CHANNEL_ID:
+                self.own_channel = channel
+
+    def member_of(self, channel) -> bool:
+        return channel is not None and self in channel.members
+
+    async def move_to(self, channel):
+        await self.guild.api_call()
+        if self.voice is None:
+            raise FakeHTTPException()
+        self.set_channel(channel)
+        if channel is not None and self.moved_at is None:
+            self.moved_at = time.perf_counter()
+
+
+class FakeHTTPException(discord.HTTPException):
+    """Réponse 400 de l'API : le membre n'est plus connecté en vocal"""
+
+    def __init__(self):
+        Exception.__init__(self, "Target user is not connected to voice.")
+        self.status = 400
+
+
+class FakeBot:
+    def __init__(self, db: Database, guild: FakeGuild, grace: float):
+        self.db = db
+        self.guild = guild
+        self.config = {
+            "jtc": {
+                "channel_id": JTC_CHANNEL_ID,
+                "category_id": None,
+                "user_limit": 0,
+                "empty_grace_seconds": grace,
+            },
+            "logs": {
+                "voice": {"events": {"channel_create": False, "channel_delete": False}}
+            },
+        }
+
+    def get_channel(self, channel_id):
+        return self.guild.get_channel(channel_id)
+
+    def log_to_file(self, *args, **kwargs):
+        pass
+
+
+def synthetic_burst(rng: random.Random) -> list:
+    """Fin de match : 40 arrivées en 2 s, 3 doubles arrivées, 2 départs du lobby"""
+    events = [
+        {"t": rng.uniform(0, 2), "member": m, "before": None, "after": JTC_CHANNEL_ID}
+        for m in range(1, 41)
+    ]
+    for m in (5, 17, 33):
+        events.append(
+            {
+                "t": rng.uniform(0, 2),
+                "member": m,
+                "before": None,
+                "after": JTC_CHANNEL_ID,
+            }
+        )
+    for m in (8, 21):
+        events.append(
+            {
+                "t": rng.uniform(2, 3),
+                "member": m,
+                "before": JTC_CHANNEL_ID,
+                "after": None,
+            }
+        )
+    return sorted(events, key=lambda e: e["t"])
+
+
+def reconnects(rng: random.Random, count: int) -> list:
+    """Connexions instables : départ puis retour dans le salon ou par le lobby"""
+    events = []
+    for m in rng.sample([m for m in range(1, 41) if m not in (8, 21)], count):
+        left = rng.uniform(4, 6)
+        back = "previous" if rng.random() < 0.5 else JTC_CHANNEL_ID
+        events.append({"t": left, "member": m, "before": "previous", "after": None})
+        events.append(
+            {
+                "t": left + rng.uniform(0.5, 3),
+                "member": m,
+                "before": None,
+                "after": back,
+            }
+        )
+    return events
+
+
+async def legacy_handler(cog: VoiceCreator, member, before, after):
+    """Ancien traitement : création, déplacement et écriture en base à chaque événement"""
+    if after.channel and after.channel.id == JTC_CHANNEL_ID:
+        new_channel = await after.channel.category.create_voice_channel(
+            name=f"🔊 Channel of {member.display_name}", user_limit=0
+        )
+        try:
+            await member.move_to(new_channel)
+        except FakeHTTPException:
+            return
+        cog.created_channels[str(new_channel.id)] = member.id
+        await cog.bot.db.execute(
+            "INSERT OR REPLACE INTO jtc_channels (channel_id, owner_id) VALUES (?, ?)",
+            (new_channel.id, member.id),
+        )
+
+
+async def main(
+    events: list,
+    legacy: bool,
+    pool_size: int,
+    grace: float,
+    bucket: tuple,
+    latency_ms: int,
+):
+    rng = random.Random(42)
+    guild = FakeGuild(latency_ms / 1000, FakeBucket(*bucket), rng)
+    category = FakeCategory(guild)
+    lobby = FakeVoiceChannel(guild, "➕ Create Channel", category, JTC_CHANNEL_ID)
+    members = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bot.db"))
+        await db.connect()
+        cog = VoiceCreator(FakeBot(db, guild, grace))
+        await cog.cog_load()
+        # Réserve pré-remplie : pas de remplissage pendant la rafale (catégorie simulée)
+        cog.pool.size = pool_size
+        cog.pool.adopt(
+            FakeVoiceChannel(guild, "🔇 JTC pool", category) for _ in range(pool_size)
+        )
+        handler = (
+            functools.partial(legacy_handler, cog)
+            if legacy
+            else cog.on_voice_state_update
+        )
+
+        tasks = []
+        start = time.perf_counter()
+        for event in events:
+            await asyncio.sleep(max(0, start + event["t"] - time.perf_counter()))
+            member = members.setdefault(
+                event["member"], FakeMember(event["member"], guild)
+            )
+            before = types.SimpleNamespace(
+                channel=member.voice.channel if member.voice else None
+            )
+            if event["after"] == "previous":
+                # Pas encore déplacé (rafale lente) ou salon supprimé entre-temps :
+                # retour par le lobby
+                own_channel = member.own_channel
+                after_channel = (
+                    own_channel and guild.get_channel(own_channel.id)
+                ) or lobby
+            else:
+                after_channel = (
+                    guild.get_channel(event["after"]) if event["after"] else None
+                )
+            if after_channel is lobby and member.joined_at is None:
+                member.joined_at = time.perf_counter()
+            member.set_channel(after_channel)
+            after = types.SimpleNamespace(channel=after_channel)
+            tasks.append(asyncio.create_task(handler(member, before, after)))
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await cog.join_queue.join()
+        elapsed = time.perf_counter() - start
+        # Attendre la fin des délais de grâce et des suppressions
+        while len(cog.empty_channels) or (
+            cog.delete_task is not None and not cog.delete_task.done()
+        ):
+            await asyncio.sleep(0.05)
+        await cog.cog_unload()
+        rows = await db.fetchall("SELECT COUNT(*) AS n FROM jtc_channels")
+        await db.close()
+
+    latencies = sorted(
+        m.moved_at - m.joined_at for m in members.values() if m.moved_at is not None
+    )
+    wasted = guild.created + cog.pool.hits - len(latencies)
+    print(
+        f"{'ancien' if legacy else 'file JTC'}: {len(events)} événements, "
+        f"{len(latencies)} joueurs déplacés en {elapsed:.2f} s, "
+        f"{guild.created} salons créés ({wasted} inutiles, {guild.deleted} supprimés), "
+        f"{rows[0]['n']} en base, {guild.calls} appels à l'API"
+    )
+    if pool_size:
+        print(f"  réserve : {cog.pool.hits} salons pris, {cog.pool.misses} manqués")
+    print(
+        f"  latence arrivée → déplacement : p50 {latencies[len(latencies) // 2] * 1000:.0f} ms, "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.0f} ms, "
+        f"max {latencies[-1] * 1000:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    legacy = "--legacy" in sys.argv
+    options = dict(a[2:].split("=") for a in sys.argv[1:] if "=" in a)
+    limit, window = options.get("bucket", "10/5").split("/")
+    files = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if files:
+        with open(files[0], "r", encoding="utf-8") as f:
+            events = sorted(
+                (json.loads(line) for line in f if line.strip()), key=lambda e: e["t"]
+            )
+    else:
+        events = synthetic_burst(random.Random(7))
+    if "reconnects" in options:
+        events = sorted(
+            events + reconnects(random.Random(3), int(options["reconnects"])),
+            key=lambda e: e["t"],
+        )
+    asyncio.run(
+        main(
+            events,
+            legacy,
+            int(options.get("pool", 0)),
+            float(options.get("grace", 5)),
+            (int(limit), float(window)),
+            int(options.get("latency", 150)),
+        )
+    )
@@ -0,0 +1,82 @@
+"""Compare l'ancienne lecture de /logs (readlines) à la lecture depuis la fin.
+
+Génère un fichier de logs synthétique (1 Go par défaut), puis mesure le temps
+pour afficher les N dernières lignes et le total de lignes : readlines() du
+fichier entier contre tail_lines() et le compteur de SegmentedLog. Le pic de
+mémoire du processus est relevé après chaque méthode.
+
+Usage : python benchmarks/bench_log_tail.py [taille_mo] [lignes]
+"""
+
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from utils.log_storage import SegmentedLog, tail_lines  # noqa: E402
+
+
+def generate(path: str, size_mb: int):
+    rng = random.Random(42)
+    words = ["gg", "salut", "quelqu'un", "pour", "une", "partie", "ce", "soir", "?"]
+    target = size_mb * 1024 * 1024
+    with open(path, "w", encoding="utf-8") as f:
+        while f.tell() < target:
+            f.writelines(
+                f"[2024-01-01 12:00:00] [Nebula] [#general] user#0000 "
+                f"(ID: {rng.randrange(10**17, 10**18)}): "
+                f"{' '.join(rng.choices(words, k=rng.randint(2, 20)))}\n"
+                for _ in range(10000)
+            )
+
+
+def peak_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def legacy(path: str, lines: int):
+    with open(path, "r", encoding="utf-8") as f:
+        all_lines = f.readlines()
+        last_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
+    return last_lines, len(all_lines)
+
+
+def measure(name: str, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>24}: {elapsed * 1000:10.2f} ms  (pic mémoire {peak_mb():7.0f} Mo)")
+    return result
+
+
+def main(size_mb: int, lines: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "messages.txt")
+        print(f"Génération de {size_mb} Mo de logs...")
+        generate(path, size_mb)
+        print(f"{os.path.getsize(path) / 1024**2:.0f} Mo, {lines} dernières lignes")
+
+        # Le segment chaud est laissé en place : pas de rotation pendant la mesure
+        storage = SegmentedLog(
+            path,
+            archive_dir=os.path.join(tmp, "archives"),
+            max_bytes=2**62,
+            max_age=float("inf"),
+        )
+        tail = measure("tail_lines", tail_lines, path, lines)
+        measure("comptage initial", storage.line_count)
+        storage.append(["[2024-01-01 12:00:00] nouvelle ligne\n"])
+        total = measure("compteur maintenu", storage.line_count)
+
+        # En dernier : readlines() fait monter le pic mémoire du processus
+        last_lines, legacy_total = measure("readlines", legacy, path, lines)
+        assert last_lines[:-1] == tail[1:] and legacy_total == total
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*(args + [1024, 10][len(args) :]))
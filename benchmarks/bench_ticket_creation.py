@@ -0,0 +1,204 @@
+"""Test de charge de la création de tickets avec une guilde simulée.
+
+Chaque utilisateur envoie plusieurs fois la sélection de catégorie en même
+temps (double-clic, raid) ; la création de salon simule la latence de l'API
+Discord. Compte les salons créés en double et mesure la latence des
+interactions, avec la réservation par utilisateur (TicketStore.reserve) ou
+avec l'ancienne vérification seule de active_tickets (--legacy). Avec
+--pool, une réserve de salons pré-créés (ChannelPool) de la taille indiquée
+est remplie avant la charge.
+
+Usage : python benchmarks/bench_ticket_creation.py [nb_utilisateurs] [clics] [latence_ms] [--legacy] [--pool=N]
+"""
+
+import asyncio
+import contextlib
+import io
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from cogs.ticket_system import TicketCreateView, TicketStore  # noqa: E402
+from utils.channel_pool import ChannelPool  # noqa: E402
+from utils.database import Database  # noqa: E402
+
+ids = itertools.count(10**17)
+
+
+class FakeMessage:
+    async def pin(self):
+        await asyncio.sleep(0)
+
+
+class FakeChannel:
+    def __init__(self, guild: "FakeGuild", name: str):
+        self.id = next(ids)
+        self.guild = guild
+        self.name = name
+        self.mention = f"<#{self.id}>"
+
+    async def edit(self, name: str, **kwargs):
+        await self.guild.api_call()
+        self.name = name
+        self.guild.created[name] += 1
+
+    async def send(self, **kwargs):
+        await asyncio.sleep(0)
+        return FakeMessage()
+
+
+class FakeGuild:
+    def __init__(self, latency: float, rng: random.Random):
+        self.latency = latency
+        self.rng = rng
+        self.default_role = object()
+        self.created = Counter()
+        self.channels = {}
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    def get_role(self, role_id):
+        return role_id
+
+    async def api_call(self):
+        # Latence de l'API variable, comme sous charge réelle
+        await asyncio.sleep(self.latency * self.rng.uniform(0.5, 1.5))
+
+    async def create_text_channel(self, name: str, **kwargs):
+        await self.api_call()
+        channel = FakeChannel(self, name)
+        self.channels[channel.id] = channel
+        self.created[name] += 1
+        return channel
+
+
+class FakeUser:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.name = f"user{user_id}"
+        self.discriminator = "0000"
+        self.mention = f"<@{user_id}>"
+
+
+class FakeResponse:
+    def __init__(self, guild: "FakeGuild"):
+        self.guild = guild
+        self.messages = []
+
+    async def send_message(self, content=None, **kwargs):
+        self.messages.append(content)
+
+    async def defer(self, **kwargs):
+        await self.guild.api_call()
+
+
+class FakeFollowup:
+    async def send(self, content=None, **kwargs):
+        await asyncio.sleep(0)
+
+
+class FakeInteraction:
+    def __init__(self, user: FakeUser, guild: FakeGuild):
+        self.user = user
+        self.guild = guild
+        self.response = FakeResponse(guild)
+        self.followup = FakeFollowup()
+
+
+class FakeCog:
+    def __init__(self, tickets: TicketStore, pool: ChannelPool):
+        self.tickets = tickets
+        self.pool = pool
+
+    def touch(self, channel_id: int):
+        pass
+
+
+class FakeBot:
+    def __init__(self, tickets: TicketStore, pool: ChannelPool):
+        self.cog = FakeCog(tickets, pool)
+        self.config = {
+            "tickets": {"category_id": None, "support_role_id": 1},
+            "logs": {"ticket": {"events": {"ticket_create": False}}},
+        }
+
+    def get_cog(self, name: str):
+        return self.cog
+
+    def log_event(self, event_type: str, **fields):
+        pass
+
+
+async def main(users: int, clicks: int, latency_ms: int, legacy: bool, pool_size: int):
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bot.db"))
+        await db.connect()
+        tickets = TicketStore(db)
+        if legacy:
+            # Ancien comportement : vérification de active_tickets uniquement
+            tickets.reserve = lambda user_id: user_id not in tickets.active_tickets
+
+        guild = FakeGuild(latency_ms / 1000, rng)
+        pool = ChannelPool(lambda: guild.create_text_channel("ticket-pool"), pool_size)
+        pool.refill()
+        while len(pool.channels) < pool_size:
+            await asyncio.sleep(0.01)
+        guild.created.clear()
+        pool.resize(0)  # Pas de remplissage pendant la mesure
+
+        view = TicketCreateView(FakeBot(tickets, pool))
+        latencies = []
+
+        async def click(user: FakeUser):
+            interaction = FakeInteraction(user, guild)
+            start = time.perf_counter()
+            await view.create_ticket_channel(interaction, "Technical")
+            latencies.append(time.perf_counter() - start)
+
+        interactions = [
+            click(FakeUser(10**18 + u)) for u in range(users) for _ in range(clicks)
+        ]
+        rng.shuffle(interactions)
+        start = time.perf_counter()
+        # Le détail par ticket affiché dans la console n'est pas utile ici
+        with contextlib.redirect_stdout(io.StringIO()):
+            await asyncio.gather(*interactions)
+        elapsed = time.perf_counter() - start
+        await db.close()
+
+    created = sum(guild.created.values())
+    duplicates = created - len(guild.created)
+    latencies.sort()
+    print(
+        f"{'ancien' if legacy else 'réservation'}: {users} utilisateurs x {clicks} "
+        f"clics, {created} salons créés, {duplicates} en double"
+    )
+    print(
+        f"  durée totale {elapsed * 1000:.0f} ms, latence médiane "
+        f"{statistics.median(latencies) * 1000:.1f} ms, p99 "
+        f"{latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms"
+    )
+    if pool_size:
+        print(
+            f"  réserve : {pool.hits} salons pris, {users - pool.hits} créés à la demande"
+        )
+    assert legacy or duplicates == 0
+    assert len(tickets.active_tickets) == users and not tickets.creating
+
+
+if __name__ == "__main__":
+    legacy = "--legacy" in sys.argv
+    pool_size = next(
+        (int(a.split("=")[1]) for a in sys.argv[1:] if a.startswith("--pool=")), 0
+    )
+    args = [int(a) for a in sys.argv[1:] if not a.startswith("--")]
+    asyncio.run(main(*(args + [500, 3, 200][len(args) :]), legacy, pool_size))
@@ -0,0 +1,69 @@
+"""Compare la recherche d'un ticket par salon : parcours linéaire vs index.
+
+Charge 5000 tickets (ouverts et fermés) dans un TicketStore, puis mesure le
+coût par message de TicketSystem.on_message dans un salon qui n'est pas un
+ticket (cas le plus fréquent) et dans un salon de ticket.
+
+Usage : python benchmarks/bench_ticket_index.py [nb_tickets] [nb_messages]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from cogs.ticket_system import TicketStore  # noqa: E402
+from utils.database import Database  # noqa: E402
+
+
+def legacy_find(store: TicketStore, channel_id: int):
+    for user_id, ticket in store.active_tickets.items():
+        if ticket["channel_id"] == channel_id:
+            return user_id, ticket
+    return None
+
+
+def run(name: str, find, channels: list):
+    start = time.perf_counter()
+    for channel_id in channels:
+        find(channel_id)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>28}: {elapsed / len(channels) * 1e6:8.3f} µs/message")
+
+
+async def main(count: int, messages: int):
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bot.db"))
+        await db.connect()
+        await db.executemany(
+            "INSERT INTO tickets (channel_id, owner_id, category, status, closed) "
+            "VALUES (?, ?, 'Technical', 'active', ?)",
+            ((10**17 + i, 10**18 + i, i % 2) for i in range(count)),
+        )
+        store = TicketStore(db)
+        start = time.perf_counter()
+        await store.load()
+        print(
+            f"{count} tickets ({len(store.active_tickets)} ouverts), "
+            f"chargement {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        await db.close()
+
+    other = [rng.randrange(10**16) for _ in range(messages)]
+    tickets = [store.active_tickets[u]["channel_id"] for u in store.active_tickets]
+    in_ticket = [rng.choice(tickets) for _ in range(messages)]
+
+    for label, channels in (("hors ticket", other), ("ticket", in_ticket)):
+        run(f"parcours ({label})", lambda c: legacy_find(store, c), channels)
+        run(f"index ({label})", store.find, channels)
+        assert all(legacy_find(store, c) == store.find(c) for c in channels[:1000])
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    asyncio.run(main(*(args + [5000, 100000][len(args) :])))
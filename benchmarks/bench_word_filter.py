@@ -0,0 +1,160 @@
+"""Compare l'ancien Moderation.check_message au BannedWordMatcher compilé.
+
+Génère une liste de mots interdits synthétique (mots et expressions) et un
+corpus de messages de chat, puis mesure le temps moyen par message, le coût
+de la normalisation seule et la détection sur un corpus obfusqué (mots
+déguisés, expressions aux séparateurs modifiés), ainsi que
+les faux positifs de la liste par défaut sur des nombres, scores et versions.
+
+Usage : python benchmarks/bench_word_filter.py [nb_mots_interdits] [nb_messages]
+"""
+
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from utils.word_filter import BannedWordMatcher, normalize  # noqa: E402
+
+LEET = str.maketrans("aeiost", "431057")
+
+# Liste par défaut de moderation.banned_words (main.py)
+DEFAULT_BANNED_WORDS = [
+    "fuck",
+    "shit",
+    "bitch",
+    "ass",
+    "putain",
+    "merde",
+    "connard",
+    "salope",
+    "pute",
+]
+# Séparateurs insérés entre les mots d'une expression interdite
+PHRASE_SEPARATORS = ("  ", "-", ".", "_", "\n", " - ", "...")
+
+# Messages légitimes dont les chiffres ressemblent à du leetspeak
+INNOCENT_MESSAGES = [
+    "on a gagné 455 à 12",
+    "patch 4.5.5 is out",
+    "score 4-5-5",
+    "the room is 4 5 5",
+    "rdv à 18h30, salle 5",
+    "version 1.3.3.7 déployée",
+    "gg 3-0, prochain match le 05/05",
+    "top 1 avec 4551 points",
+    "ip 10.4.5.5 port 5555",
+    "elo 1337 → 1500",
+]
+
+
+def legacy_check(banned_words: list, content: str):
+    content = content.lower()
+    words = re.findall(r"\b\w+\b", content)
+    for banned_word in banned_words:
+        if banned_word in words:
+            return banned_word
+        if " " in banned_word and banned_word in content:
+            return banned_word
+    return None
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+
+
+def build_corpus(banned: int, messages: int):
+    rng = random.Random(42)
+    banned_words = [random_word(rng) for _ in range(banned)]
+    banned_words += [
+        f"{random_word(rng)} {random_word(rng)}" for _ in range(banned // 10)
+    ]
+    vocabulary = [random_word(rng) for _ in range(5000)]
+
+    corpus = []
+    for _ in range(messages):
+        words = rng.choices(vocabulary, k=rng.randint(3, 30))
+        # Environ 2 % des messages contiennent un mot interdit
+        if rng.random() < 0.02:
+            words.insert(rng.randrange(len(words)), rng.choice(banned_words))
+        corpus.append(" ".join(words).capitalize() + rng.choice(".!? "))
+    return banned_words, corpus
+
+
+def obfuscate(word: str, rng: random.Random) -> str:
+    """Applique une technique de contournement au hasard"""
+    technique = rng.randrange(4)
+    if technique == 0:
+        return word.translate(LEET)
+    if technique == 1:
+        return ".".join(word)
+    if technique == 2:
+        index = rng.randrange(len(word))
+        return word[:index] + word[index] * 4 + word[index + 1 :]
+    return "\u200b".join(word).upper()
+
+
+def run(name: str, check, corpus: list) -> list:
+    start = time.perf_counter()
+    results = [check(message) for message in corpus]
+    elapsed = time.perf_counter() - start
+    print(f"{name:>18}: {elapsed / len(corpus) * 1e6:8.2f} µs/message")
+    return results
+
+
+def main(banned: int, messages: int):
+    banned_words, corpus = build_corpus(banned, messages)
+    print(f"{len(banned_words)} mots interdits, {len(corpus)} messages")
+
+    legacy = run("check_message", lambda m: legacy_check(banned_words, m), corpus)
+
+    start = time.perf_counter()
+    matcher = BannedWordMatcher(banned_words)
+    print(f"{'compilation':>18}: {(time.perf_counter() - start) * 1000:8.2f} ms")
+    compiled = run("BannedWordMatcher", matcher.find, corpus)
+    run("normalize seul", normalize, corpus)
+
+    missed = sum(1 for a, b in zip(legacy, compiled) if a and not b)
+    assert (
+        not missed
+    ), f"{missed} message(s) détecté(s) par l'ancienne méthode seulement"
+
+    rng = random.Random(7)
+    words = [w for w in banned_words if " " not in w]
+    obfuscated = [f"t'es un {obfuscate(rng.choice(words), rng)} !" for _ in range(1000)]
+    detected = sum(1 for message in obfuscated if matcher.find(message))
+    legacy_detected = sum(1 for m in obfuscated if legacy_check(banned_words, m))
+    print(
+        f"{'obfuscations':>18}: {detected}/1000 détectées "
+        f"(ancienne méthode : {legacy_detected}/1000)"
+    )
+
+    phrases = [w for w in banned_words if " " in w]
+    separated = [
+        f"t'es un {rng.choice(PHRASE_SEPARATORS).join(rng.choice(phrases).split())} !"
+        for _ in range(1000)
+    ]
+    separated += [
+        f"{separator.join(['fils', 'de', 'pute'])}" for separator in PHRASE_SEPARATORS
+    ]
+    phrase_matcher = BannedWordMatcher(banned_words + ["fils de pute"])
+    detected = sum(1 for message in separated if phrase_matcher.find(message))
+    print(f"{'séparateurs':>18}: {detected}/{len(separated)} expressions détectées")
+    assert detected == len(separated), "expression séparée non détectée"
+
+    default_matcher = BannedWordMatcher(DEFAULT_BANNED_WORDS)
+    false_positives = [m for m in INNOCENT_MESSAGES if default_matcher.find(m)]
+    print(
+        f"{'faux positifs':>18}: {len(false_positives)}/{len(INNOCENT_MESSAGES)} "
+        f"messages légitimes signalés"
+    )
+    assert not false_positives, f"faux positifs : {false_positives}"
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*(args + [3000, 10000][len(args) :]))